@@ -0,0 +1,72 @@
+"""Merge duplicate item names and make (user_id, name) unique
+
+Skills, projects, certifications and languages are unique per user by name.
+Databases created before the constraints existed can already hold duplicates:
+the oldest row of each (user_id, name) group is kept, the others' resume links
+are moved onto it and the duplicates are deleted before the constraint is added.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-14 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, constraint, association table, association column)
+UNIQUE_NAMES = [
+    ("skills", "uq_skill_user_name", "skill_resume", "skill_id"),
+    ("projects", "uq_project_user_name", "project_resume", "project_id"),
+    ("certifications", "uq_cert_user_name", "certification_resume", "certification_id"),
+    ("languages", "uq_language_user_name", "language_resume", "language_id"),
+]
+
+
+def _merge_duplicates(table: str, association: str, column: str) -> None:
+    # Every row that has an older row with the same (user_id, name), paired
+    # with the id of the oldest one
+    duplicates = f"""
+        SELECT d.id AS duplicate_id,
+               (SELECT min(k.id) FROM {table} k
+                WHERE k.user_id = d.user_id AND k.name = d.name) AS keep_id
+        FROM {table} d
+        WHERE EXISTS (SELECT 1 FROM {table} k
+                      WHERE k.user_id = d.user_id AND k.name = d.name AND k.id < d.id)
+    """
+    op.execute(sa.text(f"""
+        INSERT INTO {association} ({column}, resume_id)
+        SELECT DISTINCT dup.keep_id, a.resume_id
+        FROM {association} a JOIN ({duplicates}) dup ON a.{column} = dup.duplicate_id
+        WHERE NOT EXISTS (SELECT 1 FROM {association} k
+                          WHERE k.{column} = dup.keep_id AND k.resume_id = a.resume_id)
+    """))
+    op.execute(sa.text(f"""
+        DELETE FROM {association}
+        WHERE {column} IN (SELECT duplicate_id FROM ({duplicates}) dup)
+    """))
+    op.execute(sa.text(f"""
+        DELETE FROM {table}
+        WHERE id IN (SELECT duplicate_id FROM ({duplicates}) dup)
+    """))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, constraint, association, column in UNIQUE_NAMES:
+        _merge_duplicates(table, association, column)
+        op.create_unique_constraint(constraint, table, ["user_id", "name"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, constraint, _, _ in UNIQUE_NAMES:
+        op.drop_constraint(constraint, table, type_="unique")
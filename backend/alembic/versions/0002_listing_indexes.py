@@ -0,0 +1,56 @@
+"""Add resumes.input_hash and the listing and lookup indexes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-14 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index, table, columns), matching the Index definitions in app/models/models.py
+INDEXES = [
+    ("ix_users_email_lower", "users", [sa.text("lower(email)")]),
+    ("ix_skill_user_category", "skills", ["user_id", "category", "id"]),
+    ("ix_work_experience_user_startdate", "work_experiences", ["user_id", sa.text("start_date DESC")]),
+    ("ix_education_user_startdate", "educations", ["user_id", sa.text("start_date DESC"), sa.text("id DESC")]),
+    ("ix_project_user_id", "projects", ["user_id", "id"]),
+    ("ix_language_user_id", "languages", ["user_id", "id"]),
+    ("ix_resume_user_created", "resumes", ["user_id", sa.text("created_at DESC")]),
+    ("ix_resume_user_input_hash", "resumes", ["user_id", "input_hash"]),
+    ("ix_skill_resume_resume_id", "skill_resume", ["resume_id", "skill_id"]),
+    ("ix_skill_resume_skill_id", "skill_resume", ["skill_id"]),
+    ("ix_work_experience_resume_resume_id", "work_experience_resume", ["resume_id", "work_experience_id"]),
+    ("ix_work_experience_resume_work_experience_id", "work_experience_resume", ["work_experience_id"]),
+    ("ix_education_resume_resume_id", "education_resume", ["resume_id", "education_id"]),
+    ("ix_education_resume_education_id", "education_resume", ["education_id"]),
+    ("ix_project_resume_resume_id", "project_resume", ["resume_id", "project_id"]),
+    ("ix_project_resume_project_id", "project_resume", ["project_id"]),
+    ("ix_certification_resume_resume_id", "certification_resume", ["resume_id", "certification_id"]),
+    ("ix_certification_resume_certification_id", "certification_resume", ["certification_id"]),
+    ("ix_language_resume_resume_id", "language_resume", ["resume_id", "language_id"]),
+    ("ix_language_resume_language_id", "language_resume", ["language_id"]),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("resumes", sa.Column("input_hash", sa.String(32), nullable=True))
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
+    op.drop_column("resumes", "input_hash")
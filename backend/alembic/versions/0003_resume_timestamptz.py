@@ -0,0 +1,47 @@
+"""Store resume timestamps as timestamptz
+
+The columns held datetime.utcnow().isoformat() strings, so existing values are
+read as UTC rather than in the session time zone.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-14 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = ["created_at", "last_modified"]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for column in COLUMNS:
+        op.alter_column(
+            "resumes",
+            column,
+            type_=sa.DateTime(timezone=True),
+            postgresql_using=f"NULLIF({column}, '')::timestamp AT TIME ZONE 'UTC'",
+            server_default=sa.func.now(),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for column in COLUMNS:
+        op.alter_column(
+            "resumes",
+            column,
+            type_=sa.String(),
+            postgresql_using=f"to_char({column} AT TIME ZONE 'UTC', 'YYYY-MM-DD\"T\"HH24:MI:SS.US')",
+            server_default=None,
+        )
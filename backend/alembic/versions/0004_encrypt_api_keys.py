@@ -0,0 +1,62 @@
+"""Encrypt the AI provider keys stored before encryption at rest
+
+Rows saved before the api_key_* columns became EncryptedString still hold the
+plaintext key. Every value that does not decrypt with API_KEY_ENCRYPTION_KEY
+is encrypted in place; downgrading writes the plaintext back.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-14 10:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.encryption import decrypt_value, encrypt_value
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = ["api_key_openai", "api_key_anthropic", "api_key_google"]
+
+# Plain String columns, so values are read and written exactly as stored
+users = sa.table("users", sa.column("id", sa.Integer), *(sa.column(name, sa.String) for name in COLUMNS))
+
+
+def _rewrite_keys(convert) -> None:
+    connection = op.get_bind()
+    rows = connection.execute(sa.select(users)).mappings().all()
+    for row in rows:
+        values = {}
+        for name in COLUMNS:
+            if row[name] is None:
+                continue
+            converted = convert(row[name])
+            if converted is not None:
+                values[name] = converted
+        if values:
+            connection.execute(users.update().where(users.c.id == row["id"]).values(**values))
+
+
+def _encrypt_plaintext(value: str) -> Union[str, None]:
+    try:
+        decrypt_value(value)
+    except ValueError:
+        return encrypt_value(value)
+    return None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _rewrite_keys(_encrypt_plaintext)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _rewrite_keys(decrypt_value)
@@ -1,6 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from pydantic import BaseModel
-from typing import Optional
+from fastapi import APIRouter, Depends
+from pydantic import BaseModel, ConfigDict
+from typing import Literal, Optional
 from sqlalchemy.orm import Session
 
 from ..models.models import User
@@ -13,7 +13,7 @@ class APIKeyUpdate(BaseModel):
     api_key_openai: Optional[str] = None
     api_key_anthropic: Optional[str] = None
     api_key_google: Optional[str] = None
-    preferred_ai_provider: Optional[str] = None
+    preferred_ai_provider: Optional[Literal["openai", "anthropic", "google"]] = None
 
 class APIKeyResponse(BaseModel):
     preferred_ai_provider: Optional[str]
@@ -21,8 +21,16 @@ class APIKeyResponse(BaseModel):
     has_anthropic_key: bool
     has_google_key: bool
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
+
+def _api_key_response(user: User) -> dict:
+    """Build the APIKeyResponse payload, reporting only whether each key is set."""
+    return {
+        "preferred_ai_provider": user.preferred_ai_provider,
+        "has_openai_key": bool(user.api_key_openai),
+        "has_anthropic_key": bool(user.api_key_anthropic),
+        "has_google_key": bool(user.api_key_google)
+    }
 
 @router.get("/", response_model=APIKeyResponse)
 def get_api_keys(current_user: User = Depends(get_current_user)):
@@ -30,12 +38,7 @@ def get_api_keys(current_user: User = Depends(get_current_user)):
     Get information about the user's API keys.
     For security reasons, we don't return the actual keys, just whether they exist.
     """
-    return {
-        "preferred_ai_provider": current_user.preferred_ai_provider,
-        "has_openai_key": bool(current_user.api_key_openai),
-        "has_anthropic_key": bool(current_user.api_key_anthropic),
-        "has_google_key": bool(current_user.api_key_google)
-    }
+    return _api_key_response(current_user)
 
 @router.put("/", response_model=APIKeyResponse)
 def update_api_keys(
@@ -44,6 +47,10 @@ def update_api_keys(
     db: Session = Depends(get_db)
 ):
     """Update the user's API keys."""
+    # Nothing to change, so skip the no-op transaction
+    if not api_keys.model_dump(exclude_none=True):
+        return _api_key_response(current_user)
+
     # Update only the fields that were provided
     if api_keys.api_key_openai is not None:
         current_user.api_key_openai = api_keys.api_key_openai
@@ -55,22 +62,11 @@ def update_api_keys(
         current_user.api_key_google = api_keys.api_key_google
 
     if api_keys.preferred_ai_provider is not None:
-        valid_providers = ["openai", "anthropic", "google"]
-        if api_keys.preferred_ai_provider not in valid_providers:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Invalid AI provider. Must be one of: {', '.join(valid_providers)}"
-            )
         current_user.preferred_ai_provider = api_keys.preferred_ai_provider
 
     db.commit()
     
-    return {
-        "preferred_ai_provider": current_user.preferred_ai_provider,
-        "has_openai_key": bool(current_user.api_key_openai),
-        "has_anthropic_key": bool(current_user.api_key_anthropic),
-        "has_google_key": bool(current_user.api_key_google)
-    }
+    return _api_key_response(current_user)
 
 @router.delete("/")
 def delete_api_keys(
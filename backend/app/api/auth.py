@@ -3,13 +3,14 @@ from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr
+from sqlalchemy import func, or_
 from sqlalchemy.orm import Session
 
 from ..core.auth import authenticate_user, create_access_token, get_password_hash, ACCESS_TOKEN_EXPIRE_MINUTES
 from ..core.database import get_db
 from ..models.models import User
-from ..core.firebase_auth import verify_firebase_token
+from ..core.firebase_auth import verify_firebase_token_strict
 
 router = APIRouter()
 
@@ -27,20 +28,20 @@ class UserResponse(BaseModel):
     email: str
     username: str
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 @router.post("/register", response_model=UserResponse)
 def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
     """Register a new user."""
-    # Check if email already exists
-    db_user = db.query(User).filter(User.email == user_data.email).first()
-    if db_user:
+    # Check if email or username already exists in a single query
+    # Emails are compared case-insensitively, as at login
+    email = user_data.email.lower()
+    conflicts = db.query(User.email, User.username).filter(
+        or_(func.lower(User.email) == email, User.username == user_data.username)
+    ).all()
+    if any(row.email.lower() == email for row in conflicts):
         raise HTTPException(status_code=400, detail="Email already registered")
-    
-    # Check if username already exists
-    db_user = db.query(User).filter(User.username == user_data.username).first()
-    if db_user:
+    if conflicts:
         raise HTTPException(status_code=400, detail="Username already taken")
     
     # Create new user
@@ -52,11 +53,10 @@ def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
     )
     db.add(db_user)
     db.commit()
-    db.refresh(db_user)
     return db_user
 
 @router.post("/login", response_model=Token)
-async def login_with_firebase(firebase_user: dict = Depends(verify_firebase_token), db: Session = Depends(get_db)):
+def login_with_firebase(firebase_user: dict = Depends(verify_firebase_token_strict), db: Session = Depends(get_db)):
     """Login/register user via Firebase token and issue a backend JWT."""
     if not firebase_user or not firebase_user.get("email"):
         raise HTTPException(
@@ -77,10 +77,15 @@ async def login_with_firebase(firebase_user: dict = Depends(verify_firebase_toke
         # For simplicity, we'll use a placeholder for username if not available from Firebase token
         username = firebase_user.get("name") or email.split('@')[0] # Example username
         
-        # Check if generated username already exists
+        # Fetch every username sharing this prefix in one query,
+        # then pick the first free numeric suffix locally
+        taken = {
+            row.username
+            for row in db.query(User.username).filter(User.username.startswith(username, autoescape=True))
+        }
         temp_username = username
         counter = 1
-        while db.query(User).filter(User.username == temp_username).first():
+        while temp_username in taken:
             temp_username = f"{username}{counter}"
             counter += 1
         username = temp_username
@@ -95,7 +100,6 @@ async def login_with_firebase(firebase_user: dict = Depends(verify_firebase_toke
         )
         db.add(new_user)
         db.commit()
-        db.refresh(new_user)
         user = new_user
         print(f"New user created in local DB: {email}")
     else:
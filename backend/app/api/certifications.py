@@ -1,18 +1,26 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List, Optional, cast
+from pydantic import TypeAdapter
+from typing import List, Optional
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from ..schemas import certification_schemas
-from ..models.models import Certification as DBModelCertification, User as DBModelUser
+from ..models.models import Certification as DBModelCertification, User as DBModelUser, certification_resume_association
 from ..core.auth import get_current_user
+from ..core.crud import get_owned, json_list_response
+from ..core.databank_cache import invalidate_databank_on_write
 from ..core.database import get_db
 
+certification_list_adapter = TypeAdapter(List[certification_schemas.Certification])
+
 router = APIRouter(
-    tags=["Certifications"]
+    tags=["Certifications"],
+    dependencies=[Depends(invalidate_databank_on_write)]
 )
 
-def get_certification_by_name_for_user(db: Session, name: str, user_id: int) -> Optional[DBModelCertification]:
-    return db.query(DBModelCertification).filter(DBModelCertification.name == name, DBModelCertification.user_id == user_id).first()
+def get_certification_for_user(db: Session, certification_id: int, user_id: int) -> Optional[DBModelCertification]:
+    return get_owned(db, DBModelCertification, certification_id, user_id)
 
 @router.post("/", response_model=certification_schemas.Certification, status_code=status.HTTP_201_CREATED)
 def create_certification(
@@ -21,19 +29,18 @@ def create_certification(
     db: Session = Depends(get_db)
 ):
     """Create a new certification for the current user."""
-    user_id_actual = cast(int, current_user.id)
-    existing_certification = get_certification_by_name_for_user(db, name=certification_in.name, user_id=user_id_actual)
-    if existing_certification:
+    db_certification_data = certification_in.model_dump()
+    db_certification = DBModelCertification(**db_certification_data, user_id=current_user.id)
+    db.add(db_certification)
+    try:
+        db.commit()
+    except IntegrityError:
+        # uq_cert_user_name rejects a duplicate name for this user
+        db.rollback()
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Certification with this name already exists for the current user"
         )
-    
-    db_certification_data = certification_in.model_dump()
-    db_certification = DBModelCertification(**db_certification_data, user_id=user_id_actual)
-    db.add(db_certification)
-    db.commit()
-    db.refresh(db_certification)
     return db_certification
 
 @router.get("/", response_model=List[certification_schemas.Certification])
@@ -44,9 +51,8 @@ def get_certifications(
     limit: int = 100
 ):
     """Get all certifications for the current user."""
-    user_id_actual = cast(int, current_user.id)
-    certifications = db.query(DBModelCertification).filter(DBModelCertification.user_id == user_id_actual).offset(skip).limit(limit).all()
-    return certifications
+    certifications = db.query(DBModelCertification).filter(DBModelCertification.user_id == current_user.id).offset(skip).limit(limit).all()
+    return json_list_response(certification_list_adapter, certifications)
 
 @router.get("/{certification_id}", response_model=certification_schemas.Certification)
 def get_certification(
@@ -55,8 +61,7 @@ def get_certification(
     db: Session = Depends(get_db)
 ):
     """Get a specific certification by ID."""
-    user_id_actual = cast(int, current_user.id)
-    db_certification = db.query(DBModelCertification).filter(DBModelCertification.id == certification_id, DBModelCertification.user_id == user_id_actual).first()
+    db_certification = get_certification_for_user(db, certification_id=certification_id, user_id=current_user.id)
     if not db_certification:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Certification not found or not owned by user")
     return db_certification
@@ -69,26 +74,31 @@ def update_certification(
     db: Session = Depends(get_db)
 ):
     """Update a specific certification by ID."""
-    user_id_actual = cast(int, current_user.id)
-    db_certification = db.query(DBModelCertification).filter(DBModelCertification.id == certification_id, DBModelCertification.user_id == user_id_actual).first()
-    if not db_certification:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Certification not found or not owned by user")
-    
     update_data = certification_update_in.model_dump(exclude_unset=True)
-    
-    if 'name' in update_data and update_data['name'] != db_certification.name:
-        existing_certification_with_new_name = get_certification_by_name_for_user(db, name=update_data['name'], user_id=user_id_actual)
-        if existing_certification_with_new_name:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail="Another certification with this name already exists for the current user"
-            )
+    if not update_data:
+        db_certification = get_certification_for_user(db, certification_id=certification_id, user_id=current_user.id)
+        if not db_certification:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Certification not found or not owned by user")
+        return db_certification
 
-    for key, value in update_data.items():
-        setattr(db_certification, key, value)
-    
-    db.commit()
-    db.refresh(db_certification)
+    # Ownership check and update in one statement
+    stmt = (
+        update(DBModelCertification)
+        .where(DBModelCertification.id == certification_id, DBModelCertification.user_id == current_user.id)
+        .values(**update_data)
+        .returning(DBModelCertification)
+    )
+    try:
+        db_certification = db.execute(stmt).scalar_one_or_none()
+        if not db_certification:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Certification not found or not owned by user")
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Another certification with this name already exists for the current user"
+        )
     return db_certification
 
 @router.delete("/{certification_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -98,11 +108,17 @@ def delete_certification(
     db: Session = Depends(get_db)
 ):
     """Delete a specific certification by ID."""
-    user_id_actual = cast(int, current_user.id)
-    db_certification = db.query(DBModelCertification).filter(DBModelCertification.id == certification_id, DBModelCertification.user_id == user_id_actual).first()
-    if not db_certification:
+    owned_certification = (DBModelCertification.id == certification_id, DBModelCertification.user_id == current_user.id)
+    # Unlink it from resumes first, as the ORM delete did
+    db.execute(
+        delete(certification_resume_association)
+        .where(certification_resume_association.c.certification_id.in_(
+            select(DBModelCertification.id).where(*owned_certification)
+        ))
+    )
+    result = db.execute(delete(DBModelCertification).where(*owned_certification))
+    if result.rowcount == 0:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Certification not found or not owned by user")
     
-    db.delete(db_certification)
     db.commit()
     return None
@@ -1,14 +1,20 @@
 from datetime import date
 from fastapi import APIRouter, Depends, HTTPException, status
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, TypeAdapter
 from typing import List, Optional
+from sqlalchemy import tuple_
 from sqlalchemy.orm import Session
 
 from ..models.models import Education, User
 from ..core.auth import get_current_user
+from ..core.crud import get_owned, json_list_response
+from ..core.databank_cache import invalidate_databank_on_write
 from ..core.database import get_db
 
-router = APIRouter()
+router = APIRouter(dependencies=[Depends(invalidate_databank_on_write)])
+
+def get_education_for_user(db: Session, education_id: int, user_id: int) -> Optional[Education]:
+    return get_owned(db, Education, education_id, user_id)
 
 class EducationBase(BaseModel):
     institution: str
@@ -45,8 +51,9 @@ class EducationResponse(EducationBase):
     id: int
     user_id: int
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
+
+education_list_adapter = TypeAdapter(List[EducationResponse])
 
 @router.post("/", response_model=EducationResponse)
 def create_education(
@@ -64,12 +71,11 @@ def create_education(
     
     # Create education object
     db_education = Education(
-        **education.dict(),
+        **education.model_dump(),
         user_id=current_user.id
     )
     db.add(db_education)
     db.commit()
-    db.refresh(db_education)
     return db_education
 
 @router.get("/", response_model=List[EducationResponse])
@@ -77,14 +83,25 @@ def get_educations(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    cursor_start_date: Optional[date] = None,
+    cursor_id: Optional[int] = None
 ):
-    """Get all education entries for the current user."""
-    educations = db.query(Education)\
+    """
+    Get all education entries for the current user, newest first.
+    Pass the start_date and id of the last entry received as cursor_start_date
+    and cursor_id to fetch the next page without an OFFSET scan.
+    """
+    query = db.query(Education)\
         .filter(Education.user_id == current_user.id)\
-        .order_by(Education.start_date.desc())\
-        .offset(skip).limit(limit).all()
-    return educations
+        .order_by(Education.start_date.desc(), Education.id.desc())
+    if cursor_start_date is not None and cursor_id is not None:
+        query = query.filter(tuple_(Education.start_date, Education.id) < (cursor_start_date, cursor_id))
+    else:
+        query = query.offset(skip)
+
+    educations = query.limit(limit).all()
+    return json_list_response(education_list_adapter, educations)
 
 @router.get("/{education_id}", response_model=EducationResponse)
 def get_education(
@@ -93,10 +110,7 @@ def get_education(
     db: Session = Depends(get_db)
 ):
     """Get a specific education entry by ID."""
-    education = db.query(Education).filter(
-        Education.id == education_id,
-        Education.user_id == current_user.id
-    ).first()
+    education = get_education_for_user(db, education_id, current_user.id)
     if not education:
         raise HTTPException(status_code=404, detail="Education not found")
     return education
@@ -109,15 +123,12 @@ def update_education(
     db: Session = Depends(get_db)
 ):
     """Update a specific education entry by ID."""
-    db_education = db.query(Education).filter(
-        Education.id == education_id,
-        Education.user_id == current_user.id
-    ).first()
+    db_education = get_education_for_user(db, education_id, current_user.id)
     if not db_education:
         raise HTTPException(status_code=404, detail="Education not found")
     
     # Update only the fields that were provided
-    update_data = education.dict(exclude_unset=True)
+    update_data = education.model_dump(exclude_unset=True)
     
     # Validate that if is_current is being set to True, end_date should be None
     if update_data.get('is_current') and update_data.get('end_date'):
@@ -130,7 +141,6 @@ def update_education(
         setattr(db_education, key, value)
     
     db.commit()
-    db.refresh(db_education)
     return db_education
 
 @router.delete("/{education_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -140,10 +150,7 @@ def delete_education(
     db: Session = Depends(get_db)
 ):
     """Delete a specific education entry by ID."""
-    db_education = db.query(Education).filter(
-        Education.id == education_id,
-        Education.user_id == current_user.id
-    ).first()
+    db_education = get_education_for_user(db, education_id, current_user.id)
     if not db_education:
         raise HTTPException(status_code=404, detail="Education not found")
     
@@ -1,17 +1,206 @@
+import asyncio
+import functools
+import hashlib
+import json
+import logging
+import os
+import threading
+import uuid
+
+from cachetools import LRUCache, TTLCache
 from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
-from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
-from sqlalchemy.orm import Session
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from pydantic_core import from_json, to_json
+from typing import List, Dict, Any, Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.orm import Session, load_only
 
 from ..models.models import User, Skill, WorkExperience, Education, Certification, Language, Project
 from ..core.auth import get_current_user
-from ..core.database import get_db
-from ..services.ai_service import AIService, AIProvider, DatabankCoverage, GapRecommendation
+from ..core.database import get_db, SessionLocal
+from ..core.databank_cache import cache_databank, get_cached_databank
+from ..services.ai_service import (
+    AIService, AIProvider, AIProviderBusyError, AIProviderError, DatabankCoverage, GapRecommendation
+)
 
 router = APIRouter()
 
+logger = logging.getLogger(__name__)
+
+# User column holding the API key for each AI provider
+PROVIDER_KEY_ATTR = {
+    AIProvider.OPENAI: "api_key_openai",
+    AIProvider.ANTHROPIC: "api_key_anthropic",
+    AIProvider.GOOGLE: "api_key_google",
+}
+
+def _resolve_provider_key(user: User) -> Tuple[str, str]:
+    """Return the user's preferred AI provider and the API key stored for it."""
+    provider = user.preferred_ai_provider or AIProvider.OPENAI
+    key_attr = PROVIDER_KEY_ATTR.get(provider)
+    api_key = getattr(user, key_attr) if key_attr else None
+
+    if not api_key:
+        raise HTTPException(
+            status_code=400,
+            detail=f"No API key found for {provider}. Please add your API key in the settings."
+        )
+    return provider, api_key
+
+# AIService instances reused across requests so their HTTP clients keep
+# connections to the provider open. Keyed by a hash of the API key rather
+# than the key itself.
+_ai_services = LRUCache(maxsize=1024)
+_ai_services_lock = threading.Lock()
+
+def _get_ai_service(provider: str, api_key: str) -> AIService:
+    """Return the shared AIService for this provider and API key."""
+    key = (provider, hashlib.sha256(api_key.encode()).digest())
+    with _ai_services_lock:
+        ai_service = _ai_services.get(key)
+        if ai_service is None:
+            ai_service = AIService(api_key=api_key, provider=provider)
+            _ai_services[key] = ai_service
+    return ai_service
+
+async def get_ai_service(current_user: User = Depends(get_current_user)) -> AIService:
+    """Dependency returning the shared AIService for the current user's preferred provider and key."""
+    provider, api_key = _resolve_provider_key(current_user)
+    return _get_ai_service(provider, api_key)
+
+# AI results keyed by a hash of their inputs, so resubmitting the same job
+# description (or the same description and skills) skips the LLM call. The
+# inputs fully determine the key, so entries can live for a day.
+AI_RESULT_CACHE_TTL_SECONDS = int(os.getenv("AI_RESULT_CACHE_TTL_SECONDS", "86400"))
+_ai_result_cache = TTLCache(maxsize=1024, ttl=AI_RESULT_CACHE_TTL_SECONDS)
+_ai_result_cache_lock = threading.Lock()
+
+def _cache_get(key: str) -> Optional[Dict[str, Any]]:
+    with _ai_result_cache_lock:
+        return _ai_result_cache.get(key)
+
+def _cache_put(key: str, result: Dict[str, Any]) -> None:
+    with _ai_result_cache_lock:
+        _ai_result_cache[key] = result
+
+def _normalize_job_description(job_description: str) -> str:
+    """Collapse whitespace so the same description pasted differently shares a cache entry."""
+    return " ".join(job_description.split())
+
+def _job_description_cache_key(ai_service: AIService, job_description: str) -> str:
+    jd_hash = hashlib.sha256(job_description.encode()).hexdigest()
+    return f"jd:{ai_service.provider}:{jd_hash}"
+
+def _skill_match_cache_key(
+    ai_service: AIService,
+    job_description: str,
+    skills_data: List[Dict[str, Any]]
+) -> str:
+    jd_hash = hashlib.sha256(job_description.encode()).hexdigest()
+    skills_hash = hashlib.sha256(json.dumps(skills_data, sort_keys=True).encode()).hexdigest()
+    return f"match:{ai_service.provider}:{jd_hash}:{skills_hash}"
+
+async def _analyze_job_description_cached(ai_service: AIService, job_description: str) -> Dict[str, Any]:
+    key = _job_description_cache_key(ai_service, job_description)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+
+    result = await ai_service.analyze_job_description_async(job_description)
+    _cache_put(key, result)
+    return result
+
+async def _match_skills_to_job_cached(
+    ai_service: AIService,
+    job_description: str,
+    job_analysis: Dict[str, Any],
+    skills_data: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    key = _skill_match_cache_key(ai_service, job_description, skills_data)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+
+    result = await ai_service.match_skills_to_job_async(job_analysis, skills_data)
+    _cache_put(key, result)
+    return result
+
+async def _validate_databank_coverage_cached(
+    ai_service: AIService,
+    job_description: str,
+    job_analysis: Dict[str, Any],
+    user_databank: Dict[str, Any]
+) -> DatabankCoverage:
+    """
+    Coverage keyed by the job description and the databank contents, which rarely change between steps.
+    Only the summary the coverage prompt is built from is hashed, so the full
+    and the coverage-only databank of the same user share an entry.
+    """
+    jd_hash = hashlib.sha256(job_description.encode()).hexdigest()
+    databank_hash = hashlib.sha256(to_json(ai_service.summarize_databank(user_databank))).hexdigest()
+    key = f"coverage:{ai_service.provider}:{jd_hash}:{databank_hash}"
+    cached = _cache_get(key)
+    if cached is not None:
+        return DatabankCoverage(**cached)
+
+    coverage = await ai_service.validate_databank_coverage_async(job_analysis, user_databank)
+    if not coverage.analysis_failed:
+        _cache_put(key, coverage.model_dump())
+    return coverage
+
+async def _resolve_coverage(
+    ai_service: AIService,
+    supplied: Optional["DatabankValidationResponse"],
+    job_description: str,
+    job_analysis: Dict[str, Any],
+    user_databank: Dict[str, Any]
+) -> DatabankCoverage:
+    """Use the coverage the client sent back from validate-databank-coverage, or compute it."""
+    if supplied is not None:
+        return DatabankCoverage(**supplied.model_dump())
+    return await _validate_databank_coverage_cached(ai_service, job_description, job_analysis, user_databank)
+
+# Work currently running for identical requests (same endpoint, user and
+# body), so a double submit or client retry waits for the first call's result
+# instead of paying for a second LLM chain
+_inflight: Dict[str, "asyncio.Task"] = {}
+
+def _mark_exception_retrieved(task: "asyncio.Task") -> None:
+    if not task.cancelled():
+        task.exception()
+
+def _deduplicate_in_flight(endpoint):
+    """
+    Share one execution of endpoint between concurrent identical requests.
+    The shared execution can outlive the request that started it, so it runs
+    with its own session rather than that request's db, which get_db closes.
+    """
+    async def run_with_own_session(request: BaseModel, current_user: User, **dependencies):
+        db = SessionLocal()
+        try:
+            return await endpoint(request, current_user=current_user, **{**dependencies, "db": db})
+        finally:
+            await run_in_threadpool(db.close)
+
+    @functools.wraps(endpoint)
+    async def wrapper(request: BaseModel, current_user: User, **dependencies):
+        body_hash = hashlib.sha256(request.model_dump_json().encode()).hexdigest()
+        key = f"{endpoint.__name__}:{current_user.id}:{body_hash}"
+
+        task = _inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(run_with_own_session(request, current_user, **dependencies))
+            task.add_done_callback(_mark_exception_retrieved)
+            task.add_done_callback(lambda done: _inflight.pop(key) if _inflight.get(key) is done else None)
+            _inflight[key] = task
+        # Shielded so one caller disconnecting does not cancel the shared work
+        return await asyncio.shield(task)
+    return wrapper
+
 class JobAnalysisRequest(BaseModel):
-    job_description: str
+    job_description: str = Field(..., min_length=40, max_length=20000)
 
 class JobAnalysisResponse(BaseModel):
     job_title: str
@@ -58,6 +247,9 @@ class GapRecommendationResponse(BaseModel):
 
 class DatabankEnhancementRequest(BaseModel):
     job_description: str
+    # Result of an earlier validate-databank-coverage call for the same job
+    # description; skips recomputing it
+    coverage_analysis: Optional[DatabankValidationResponse] = None
 
 class DatabankEnhancementResponse(BaseModel):
     recommendations: List[GapRecommendationResponse]
@@ -67,6 +259,7 @@ class DatabankEnhancementResponse(BaseModel):
 class AntiHallucinationResumeRequest(BaseModel):
     job_description: str
     max_databank_utilization: bool = True
+    coverage_analysis: Optional[DatabankValidationResponse] = None  # As in DatabankEnhancementRequest
 
 class AntiHallucinationResumeResponse(BaseModel):
     resume_content: Dict[str, Any]
@@ -75,477 +268,530 @@ class AntiHallucinationResumeResponse(BaseModel):
     enhancement_suggestions: List[GapRecommendationResponse]
 
 @router.post("/analyze", response_model=JobAnalysisResponse)
-def analyze_job_description(
+async def analyze_job_description(
     request: JobAnalysisRequest,
     current_user: User = Depends(get_current_user),
+    ai_service: AIService = Depends(get_ai_service),
     db: Session = Depends(get_db)
 ):
     """
     Analyze a job description to extract key information like required skills,
     experience level, and responsibilities.
     """
-    # Check if user has API keys
-    provider = current_user.preferred_ai_provider or AIProvider.OPENAI
-    api_key = None
+    # Analyze the job description
+    job_description = _normalize_job_description(request.job_description)
+    result = await _analyze_job_description_cached(ai_service, job_description)
     
-    if provider == AIProvider.OPENAI:
-        api_key = current_user.api_key_openai
-    elif provider == AIProvider.ANTHROPIC:
-        api_key = current_user.api_key_anthropic
-    elif provider == AIProvider.GOOGLE:
-        api_key = current_user.api_key_google
-    
-    if not api_key:
-        raise HTTPException(
-            status_code=400,
-            detail=f"No API key found for {provider}. Please add your API key in the settings."
-        )
-    
-    # Initialize AI service with the user's API key
-    ai_service = AIService(api_key=api_key, provider=provider)
-    
-    try:
-        # Analyze the job description
-        result = ai_service.analyze_job_description(request.job_description)
-        
-        if "error" in result:
-            raise HTTPException(
-                status_code=500,
-                detail=f"Error analyzing job description: {result['error']}"
-            )
-        
-        return result
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Failed to analyze job description: {str(e)}"
+    return result
+
+def _load_skills_data(db: Session, user_id: int, skill_ids: Optional[List[int]]) -> List[Dict[str, Any]]:
+    """Load the user's skills (optionally limited to skill_ids) in the format the AI service expects."""
+    query = db.query(Skill).options(
+        load_only(
+            Skill.name,
+            Skill.category,
+            Skill.experience_level,
+            Skill.years_of_experience,
+            Skill.details
         )
+    ).filter(Skill.user_id == user_id)
+    if skill_ids:
+        query = query.filter(Skill.id.in_(skill_ids))
+
+    return [
+        {
+            "name": skill.name,
+            "category": skill.category,
+            "experience_level": skill.experience_level.value if skill.experience_level else "Not specified",
+            "years_of_experience": skill.years_of_experience,
+            "details": skill.details
+        }
+        for skill in query.all()
+    ]
 
 @router.post("/match-skills", response_model=SkillMatchResponse)
-def match_skills_to_job(
+async def match_skills_to_job(
     request: SkillMatchRequest,
     current_user: User = Depends(get_current_user),
+    ai_service: AIService = Depends(get_ai_service),
     db: Session = Depends(get_db)
 ):
     """
     Match the user's skills to a job description and identify gaps.
     """
-    # Check if user has API keys
-    provider = current_user.preferred_ai_provider or AIProvider.OPENAI
-    api_key = None
-    
-    if provider == AIProvider.OPENAI:
-        api_key = current_user.api_key_openai
-    elif provider == AIProvider.ANTHROPIC:
-        api_key = current_user.api_key_anthropic
-    elif provider == AIProvider.GOOGLE:
-        api_key = current_user.api_key_google
-    
-    if not api_key:
-        raise HTTPException(
-            status_code=400,
-            detail=f"No API key found for {provider}. Please add your API key in the settings."
-        )
-    
     # Get the user's skills
-    if request.skill_ids:
-        skills = db.query(Skill).filter(
-            Skill.user_id == current_user.id,
-            Skill.id.in_(request.skill_ids)
-        ).all()
-    else:
-        skills = db.query(Skill).filter(
-            Skill.user_id == current_user.id
-        ).all()
+    skills_data = await run_in_threadpool(
+        _load_skills_data, db, current_user.id, request.skill_ids
+    )
     
-    if not skills:
+    if not skills_data:
         raise HTTPException(
             status_code=400,
             detail="No skills found. Please add skills to your profile first."
         )
     
-    # Initialize AI service with the user's API key
-    ai_service = AIService(api_key=api_key, provider=provider)
+    # First analyze the job description
+    job_description = _normalize_job_description(request.job_description)
+    job_analysis = await _analyze_job_description_cached(ai_service, job_description)
     
-    try:
-        # First analyze the job description
-        job_analysis = ai_service.analyze_job_description(request.job_description)
-        
-        if "error" in job_analysis:
-            raise HTTPException(
-                status_code=500,
-                detail=f"Error analyzing job description: {job_analysis['error']}"
-            )
-        
-        # Convert skills to dictionary format for the AI service
-        skills_data = [
-            {
-                "name": skill.name,
-                "category": skill.category,
-                "experience_level": skill.experience_level.value if skill.experience_level else "Not specified",
-                "years_of_experience": skill.years_of_experience,
-                "details": skill.details
-            }
-            for skill in skills
-        ]
-        
-        # Match skills to the job
-        match_result = ai_service.match_skills_to_job(job_analysis, skills_data)
-        
-        if "error" in match_result:
-            raise HTTPException(
-                status_code=500,
-                detail=f"Error matching skills: {match_result['error']}"
-            )
-        
-        return match_result
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Failed to match skills to job: {str(e)}"
-        )
+    # Match skills to the job
+    match_result = await _match_skills_to_job_cached(ai_service, job_description, job_analysis, skills_data)
+    
+    return match_result
+
+# Columns sent to the AI for each databank section, in output order
+DATABANK_COLUMNS = {
+    "skills": (
+        Skill.id, Skill.name, Skill.category, Skill.experience_level,
+        Skill.years_of_experience, Skill.details, Skill.keywords
+    ),
+    "work_experiences": (
+        WorkExperience.id, WorkExperience.company, WorkExperience.job_title,
+        WorkExperience.start_date, WorkExperience.end_date, WorkExperience.is_current,
+        WorkExperience.city, WorkExperience.state, WorkExperience.country,
+        WorkExperience.description, WorkExperience.responsibilities, WorkExperience.achievements
+    ),
+    "educations": (
+        Education.id, Education.institution, Education.degree, Education.field_of_study,
+        Education.start_date, Education.end_date, Education.is_current,
+        Education.city, Education.state, Education.country,
+        Education.gpa, Education.achievements, Education.activities
+    ),
+    "certifications": (
+        Certification.id, Certification.name, Certification.issuing_organization,
+        Certification.issue_date, Certification.expiration_date,
+        Certification.credential_id, Certification.credential_url
+    ),
+    "languages": (Language.id, Language.name, Language.proficiency),
+    "projects": (
+        Project.id, Project.name, Project.description, Project.start_date, Project.end_date,
+        Project.is_current, Project.url, Project.technologies
+    ),
+}
+
+DATABANK_PROFILE_COLUMNS = (
+    User.full_name, User.email, User.phone, User.city, User.state, User.country,
+    User.summary, User.linkedin, User.github, User.website
+)
+
+# The subset of the databank coverage analysis reads; contact details,
+# descriptions and URLs only matter when the resume itself is written
+DATABANK_COVERAGE_COLUMNS = {
+    "skills": (Skill.name, Skill.category, Skill.experience_level, Skill.years_of_experience),
+    "work_experiences": (WorkExperience.job_title, WorkExperience.company),
+    "educations": (Education.degree, Education.field_of_study),
+    "certifications": (Certification.name,),
+    "languages": (Language.name, Language.proficiency),
+    "projects": (Project.name, Project.technologies),
+}
+
+def _load_databank_sections(
+    user: User,
+    db: Session,
+    section_columns: Dict[str, Tuple[Any, ...]]
+) -> Dict[str, Any]:
+    """Select the given columns of each databank section for the user."""
+    databank = {}
+    for section, columns in section_columns.items():
+        model = columns[0].class_
+        rows = db.execute(select(*columns).where(model.user_id == user.id)).mappings()
+        # Dates and enums stay as-is; to_json serializes them natively when
+        # the databank is hashed or embedded in a prompt
+        databank[section] = [dict(row) for row in rows]
+
+    for exp in databank["work_experiences"]:
+        exp["years"] = 0  # Calculate if needed
+
+    return databank
 
 def _get_complete_user_databank(user: User, db: Session) -> Dict[str, Any]:
     """Helper function to gather complete user databank for anti-hallucination analysis."""
-    # Get all user data
-    skills = db.query(Skill).filter(Skill.user_id == user.id).all()
-    work_experiences = db.query(WorkExperience).filter(WorkExperience.user_id == user.id).all()
-    educations = db.query(Education).filter(Education.user_id == user.id).all()
-    certifications = db.query(Certification).filter(Certification.user_id == user.id).all()
-    languages = db.query(Language).filter(Language.user_id == user.id).all()
-    projects = db.query(Project).filter(Project.user_id == user.id).all()
-    
-    # Convert to dictionaries for AI processing
-    databank = {
-        "user_profile": {
-            "full_name": user.full_name,
-            "email": user.email,
-            "phone": user.phone,
-            "city": user.city,
-            "state": user.state,
-            "country": user.country,
-            "summary": user.summary,
-            "linkedin": user.linkedin,
-            "github": user.github,
-            "website": user.website
-        },
-        "skills": [
-            {
-                "id": skill.id,
-                "name": skill.name,
-                "category": skill.category,
-                "experience_level": skill.experience_level.value if skill.experience_level else None,
-                "years_of_experience": skill.years_of_experience,
-                "details": skill.details,
-                "keywords": skill.keywords
-            }
-            for skill in skills
-        ],
-        "work_experiences": [
-            {
-                "id": exp.id,
-                "company": exp.company,
-                "job_title": exp.job_title,
-                "start_date": exp.start_date.isoformat() if exp.start_date else None,
-                "end_date": exp.end_date.isoformat() if exp.end_date else None,
-                "is_current": exp.is_current,
-                "city": exp.city,
-                "state": exp.state,
-                "country": exp.country,
-                "description": exp.description,
-                "achievements": exp.achievements,
-                "technologies_used": exp.technologies_used,
-                "years": getattr(exp, 'years', 0)  # Calculate if needed
-            }
-            for exp in work_experiences
-        ],
-        "educations": [
-            {
-                "id": edu.id,
-                "institution": edu.institution,
-                "degree": edu.degree,
-                "field_of_study": edu.field_of_study,
-                "start_date": edu.start_date.isoformat() if edu.start_date else None,
-                "end_date": edu.end_date.isoformat() if edu.end_date else None,
-                "is_current": edu.is_current,
-                "city": edu.city,
-                "state": edu.state,
-                "country": edu.country,
-                "gpa": str(edu.gpa) if edu.gpa else None,
-                "achievements": edu.achievements,
-                "activities": edu.activities
-            }
-            for edu in educations
-        ],
-        "certifications": [
-            {
-                "id": cert.id,
-                "name": cert.name,
-                "issuing_organization": cert.issuing_organization,
-                "issue_date": cert.issue_date.isoformat() if cert.issue_date else None,
-                "expiration_date": cert.expiration_date.isoformat() if cert.expiration_date else None,
-                "credential_id": cert.credential_id,
-                "credential_url": cert.credential_url,
-                "description": cert.description
-            }
-            for cert in certifications
-        ],
-        "languages": [
-            {
-                "id": lang.id,
-                "name": lang.name,
-                "proficiency": lang.proficiency.value if lang.proficiency else None,
-                "details": lang.details
-            }
-            for lang in languages
-        ],
-        "projects": [
-            {
-                "id": proj.id,
-                "name": proj.name,
-                "description": proj.description,
-                "start_date": proj.start_date.isoformat() if proj.start_date else None,
-                "end_date": proj.end_date.isoformat() if proj.end_date else None,
-                "is_current": proj.is_current,
-                "project_url": proj.project_url,
-                "github_url": proj.github_url,
-                "technologies_used": proj.technologies_used,
-                "achievements": proj.achievements,
-                "project_type": proj.project_type
-            }
-            for proj in projects
-        ]
-    }
-    
+    databank = get_cached_databank(user.id, "complete")
+    if databank is not None:
+        return databank
+
+    # Plain column selects: rows come back as mappings, so no ORM instances
+    # are built just to be turned into dictionaries
+    profile = db.execute(
+        select(*DATABANK_PROFILE_COLUMNS).where(User.id == user.id)
+    ).mappings().one()
+    databank = {"user_profile": dict(profile)}
+    databank.update(_load_databank_sections(user, db, DATABANK_COLUMNS))
+    cache_databank(user.id, "complete", databank)
+    return databank
+
+def _get_databank_for_coverage(user: User, db: Session) -> Dict[str, Any]:
+    """Gather only the databank fields used by coverage validation and gap analysis."""
+    databank = get_cached_databank(user.id, "coverage")
+    if databank is None:
+        databank = _load_databank_sections(user, db, DATABANK_COVERAGE_COLUMNS)
+        cache_databank(user.id, "coverage", databank)
     return databank
 
 @router.post("/validate-databank-coverage", response_model=DatabankValidationResponse)
-def validate_databank_coverage(
+@_deduplicate_in_flight
+async def validate_databank_coverage(
     request: DatabankValidationRequest,
     current_user: User = Depends(get_current_user),
+    ai_service: AIService = Depends(get_ai_service),
     db: Session = Depends(get_db)
 ):
     """
     Validate user's databank coverage against job requirements.
     Core anti-hallucination endpoint that identifies gaps before generation.
     """
-    try:
-        # Get user's AI configuration
-        api_key = None
-        provider = current_user.preferred_ai_provider or "openai"
-        
-        if provider == "openai":
-            api_key = current_user.api_key_openai
-        elif provider == "anthropic":
-            api_key = current_user.api_key_anthropic
-        elif provider == "google":
-            api_key = current_user.api_key_google
-        
-        if not api_key:
-            raise HTTPException(
-                status_code=400,
-                detail=f"No API key configured for {provider}. Please add your API key in settings."
-            )
-        
-        # Initialize AI service
-        ai_service = AIService(api_key=api_key, provider=provider)
-        
-        # Analyze job description
-        job_analysis = ai_service.analyze_job_description(request.job_description)
-        
-        if "error" in job_analysis:
-            raise HTTPException(
-                status_code=500,
-                detail=f"Error analyzing job: {job_analysis['error']}"
-            )
-        
-        # Get complete user databank
-        user_databank = _get_complete_user_databank(current_user, db)
-        
-        # Validate databank coverage
-        coverage_analysis = ai_service.validate_databank_coverage(job_analysis, user_databank)
-        
-        return DatabankValidationResponse(
-            coverage_summary=coverage_analysis.coverage_summary,
-            critical_gaps=coverage_analysis.critical_gaps,
-            transferable_skills=coverage_analysis.transferable_skills,
-            databank_utilization_percentage=coverage_analysis.databank_utilization_percentage
-        )
-        
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Failed to validate databank coverage: {str(e)}"
-        )
+    # Analyze job description while the user's databank loads
+    job_description = _normalize_job_description(request.job_description)
+    job_analysis, user_databank = await asyncio.gather(
+        _analyze_job_description_cached(ai_service, job_description),
+        run_in_threadpool(_get_databank_for_coverage, current_user, db)
+    )
+    
+    # Validate databank coverage
+    coverage_analysis = await _validate_databank_coverage_cached(ai_service, job_description, job_analysis, user_databank)
+    
+    return DatabankValidationResponse(
+        coverage_summary=coverage_analysis.coverage_summary,
+        critical_gaps=coverage_analysis.critical_gaps,
+        transferable_skills=coverage_analysis.transferable_skills,
+        databank_utilization_percentage=coverage_analysis.databank_utilization_percentage
+    )
 
 @router.post("/suggest-databank-enhancements", response_model=DatabankEnhancementResponse)
-def suggest_databank_enhancements(
+@_deduplicate_in_flight
+async def suggest_databank_enhancements(
     request: DatabankEnhancementRequest,
     current_user: User = Depends(get_current_user),
+    ai_service: AIService = Depends(get_ai_service),
     db: Session = Depends(get_db)
 ):
     """
     Generate specific suggestions for databank enhancement based on job requirements.
     """
-    try:
-        # Get user's AI configuration
-        api_key = None
-        provider = current_user.preferred_ai_provider or "openai"
-        
-        if provider == "openai":
-            api_key = current_user.api_key_openai
-        elif provider == "anthropic":
-            api_key = current_user.api_key_anthropic
-        elif provider == "google":
-            api_key = current_user.api_key_google
-        
-        if not api_key:
-            raise HTTPException(
-                status_code=400,
-                detail=f"No API key configured for {provider}. Please add your API key in settings."
-            )
-        
-        # Initialize AI service
-        ai_service = AIService(api_key=api_key, provider=provider)
-        
-        # Analyze job description
-        job_analysis = ai_service.analyze_job_description(request.job_description)
-        
-        if "error" in job_analysis:
-            raise HTTPException(
-                status_code=500,
-                detail=f"Error analyzing job: {job_analysis['error']}"
-            )
-        
-        # Get complete user databank
-        user_databank = _get_complete_user_databank(current_user, db)
-        
-        # Validate databank coverage first
-        coverage_analysis = ai_service.validate_databank_coverage(job_analysis, user_databank)
-        
-        # Get gap recommendations
-        gap_recommendations = ai_service.identify_databank_gaps(coverage_analysis, job_analysis)
-        
-        # Convert to response format
-        recommendations = [
-            GapRecommendationResponse(
-                category=rec.category,
-                item_type=rec.item_type,
-                suggestion=rec.suggestion,
-                priority=rec.priority,
-                reasoning=rec.reasoning
-            )
-            for rec in gap_recommendations
-        ]
-        
-        # Calculate priority order and estimated improvement
-        priority_order = [rec.category for rec in gap_recommendations if rec.priority == "high"]
-        estimated_improvement = {
-            "skills_coverage": min(100.0, coverage_analysis.databank_utilization_percentage + len([r for r in gap_recommendations if r.category == "skills" and r.priority == "high"]) * 10),
-            "overall_match": min(100.0, coverage_analysis.databank_utilization_percentage + len(gap_recommendations) * 5)
-        }
-        
-        return DatabankEnhancementResponse(
-            recommendations=recommendations,
-            priority_order=priority_order,
-            estimated_improvement=estimated_improvement
-        )
-        
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Failed to suggest databank enhancements: {str(e)}"
+    # Analyze job description while the user's databank loads
+    job_description = _normalize_job_description(request.job_description)
+    job_analysis, user_databank = await asyncio.gather(
+        _analyze_job_description_cached(ai_service, job_description),
+        run_in_threadpool(_get_databank_for_coverage, current_user, db)
+    )
+    
+    # Validate databank coverage first
+    coverage_analysis = await _resolve_coverage(
+        ai_service, request.coverage_analysis, job_description, job_analysis, user_databank
+    )
+    
+    # Get gap recommendations
+    gap_recommendations = await ai_service.identify_databank_gaps_async(coverage_analysis, job_analysis)
+    
+    # Convert to response format
+    recommendations = [
+        GapRecommendationResponse(
+            category=rec.category,
+            item_type=rec.item_type,
+            suggestion=rec.suggestion,
+            priority=rec.priority,
+            reasoning=rec.reasoning
         )
+        for rec in gap_recommendations
+    ]
+    
+    # Calculate priority order and estimated improvement
+    priority_order = [rec.category for rec in gap_recommendations if rec.priority == "high"]
+    estimated_improvement = {
+        "skills_coverage": min(100.0, coverage_analysis.databank_utilization_percentage + len([r for r in gap_recommendations if r.category == "skills" and r.priority == "high"]) * 10),
+        "overall_match": min(100.0, coverage_analysis.databank_utilization_percentage + len(gap_recommendations) * 5)
+    }
+    
+    return DatabankEnhancementResponse(
+        recommendations=recommendations,
+        priority_order=priority_order,
+        estimated_improvement=estimated_improvement
+    )
 
 @router.post("/generate-anti-hallucination-resume", response_model=AntiHallucinationResumeResponse)
-def generate_anti_hallucination_resume(
+@_deduplicate_in_flight
+async def generate_anti_hallucination_resume(
     request: AntiHallucinationResumeRequest,
     current_user: User = Depends(get_current_user),
+    ai_service: AIService = Depends(get_ai_service),
     db: Session = Depends(get_db)
 ):
     """
     Generate resume content using ONLY verified databank information.
     This is the core anti-hallucination resume generation endpoint.
     """
-    try:
-        # Get user's AI configuration
-        api_key = None
-        provider = current_user.preferred_ai_provider or "openai"
-        
-        if provider == "openai":
-            api_key = current_user.api_key_openai
-        elif provider == "anthropic":
-            api_key = current_user.api_key_anthropic
-        elif provider == "google":
-            api_key = current_user.api_key_google
-        
-        if not api_key:
-            raise HTTPException(
-                status_code=400,
-                detail=f"No API key configured for {provider}. Please add your API key in settings."
-            )
-        
-        # Initialize AI service
-        ai_service = AIService(api_key=api_key, provider=provider)
-        
-        # Analyze job description
-        job_analysis = ai_service.analyze_job_description(request.job_description)
-        
-        if "error" in job_analysis:
-            raise HTTPException(
-                status_code=500,
-                detail=f"Error analyzing job: {job_analysis['error']}"
-            )
-        
-        # Get complete user databank
-        user_databank = _get_complete_user_databank(current_user, db)
-        
-        # Validate databank coverage
-        coverage_analysis = ai_service.validate_databank_coverage(job_analysis, user_databank)
-        
-        # Generate gap recommendations
-        gap_recommendations = ai_service.identify_databank_gaps(coverage_analysis, job_analysis)
-        
-        # Generate anti-hallucination resume
-        resume_result = ai_service.generate_anti_hallucination_resume(
+    # Analyze job description while the user's databank loads
+    job_description = _normalize_job_description(request.job_description)
+    job_analysis, user_databank = await asyncio.gather(
+        _analyze_job_description_cached(ai_service, job_description),
+        run_in_threadpool(_get_complete_user_databank, current_user, db)
+    )
+    
+    # Validate databank coverage
+    coverage_analysis = await _resolve_coverage(
+        ai_service, request.coverage_analysis, job_description, job_analysis, user_databank
+    )
+    
+    # Gap recommendations and the resume both depend only on the coverage
+    # analysis, so generate them concurrently
+    gap_recommendations, resume_result = await asyncio.gather(
+        ai_service.identify_databank_gaps_async(coverage_analysis, job_analysis),
+        ai_service.generate_anti_hallucination_resume_async(
             user_databank, 
             job_analysis, 
             coverage_analysis,
             request.max_databank_utilization
         )
-        
-        if "error" in resume_result:
-            raise HTTPException(
-                status_code=500,
-                detail=f"Error generating resume: {resume_result['error']}"
-            )
-        
-        # Convert recommendations to response format
-        enhancement_suggestions = [
-            GapRecommendationResponse(
-                category=rec.category,
-                item_type=rec.item_type,
-                suggestion=rec.suggestion,
-                priority=rec.priority,
-                reasoning=rec.reasoning
-            )
-            for rec in gap_recommendations
-        ]
-        
-        return AntiHallucinationResumeResponse(
-            resume_content=resume_result,
-            databank_utilization_report=resume_result.get("databank_utilization_report", {}),
-            coverage_analysis=DatabankValidationResponse(
-                coverage_summary=coverage_analysis.coverage_summary,
-                critical_gaps=coverage_analysis.critical_gaps,
-                transferable_skills=coverage_analysis.transferable_skills,
-                databank_utilization_percentage=coverage_analysis.databank_utilization_percentage
-            ),
-            enhancement_suggestions=enhancement_suggestions
+    )
+    
+    # Convert recommendations to response format
+    enhancement_suggestions = [
+        GapRecommendationResponse(
+            category=rec.category,
+            item_type=rec.item_type,
+            suggestion=rec.suggestion,
+            priority=rec.priority,
+            reasoning=rec.reasoning
         )
-        
+        for rec in gap_recommendations
+    ]
+    
+    return AntiHallucinationResumeResponse(
+        resume_content=resume_result,
+        databank_utilization_report=resume_result.get("databank_utilization_report", {}),
+        coverage_analysis=DatabankValidationResponse(
+            coverage_summary=coverage_analysis.coverage_summary,
+            critical_gaps=coverage_analysis.critical_gaps,
+            transferable_skills=coverage_analysis.transferable_skills,
+            databank_utilization_percentage=coverage_analysis.databank_utilization_percentage
+        ),
+        enhancement_suggestions=enhancement_suggestions
+    )
+
+def _sse_event(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+class _SectionScanner:
+    """
+    Finds the top-level fields of a JSON object as it streams in.
+    Each chunk is scanned once; a field is parsed on its own when the comma or
+    closing brace after it arrives, so the work stays linear in the response.
+    """
+
+    def __init__(self):
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._field: List[str] = []  # Text of the field being streamed
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """Return the (name, value) of each field completed by this chunk."""
+        completed = []
+        start = 0
+        for i, char in enumerate(chunk):
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+                if self._depth == 1:
+                    start = i + 1
+            elif char in "}]" or (char == "," and self._depth == 1):
+                if self._depth == 1:
+                    self._field.append(chunk[start:i])
+                    completed.extend(self._parse_field())
+                    start = i + 1
+                if char != ",":
+                    self._depth -= 1
+        if self._depth >= 1:
+            self._field.append(chunk[start:])
+        return completed
+
+    def _parse_field(self) -> List[Tuple[str, Any]]:
+        text = "".join(self._field)
+        self._field = []
+        try:
+            field = from_json("{" + text + "}")
+        except ValueError:
+            return []
+        return list(field.items())
+
+@router.post("/generate-anti-hallucination-resume/stream")
+async def stream_anti_hallucination_resume(
+    request: AntiHallucinationResumeRequest,
+    current_user: User = Depends(get_current_user),
+    ai_service: AIService = Depends(get_ai_service),
+    db: Session = Depends(get_db)
+):
+    """
+    Server-sent events variant of generate-anti-hallucination-resume.
+    Emits a "coverage" event, then "token" events with the resume text as it is
+    generated, interleaved with a "section" event as each top-level resume field
+    completes, then "enhancements" and a final "resume" event (or "error").
+    """
+    # Everything before the resume itself runs up front, so failures here
+    # still return a normal HTTP error instead of a broken stream
+    job_description = _normalize_job_description(request.job_description)
+    job_analysis, user_databank = await asyncio.gather(
+        _analyze_job_description_cached(ai_service, job_description),
+        run_in_threadpool(_get_complete_user_databank, current_user, db)
+    )
+    coverage_analysis = await _resolve_coverage(
+        ai_service, request.coverage_analysis, job_description, job_analysis, user_databank
+    )
+
+    async def events():
+        yield _sse_event("coverage", coverage_analysis.model_dump())
+
+        # Gap recommendations are generated while the resume streams
+        gaps_task = asyncio.create_task(
+            ai_service.identify_databank_gaps_async(coverage_analysis, job_analysis)
+        )
+        try:
+            chunks = []
+            sections = _SectionScanner()
+            async for chunk in ai_service.stream_anti_hallucination_resume(
+                user_databank, job_analysis, coverage_analysis, request.max_databank_utilization
+            ):
+                chunks.append(chunk)
+                yield _sse_event("token", {"content": chunk})
+                for name, content in sections.feed(chunk):
+                    yield _sse_event("section", {"name": name, "content": content})
+
+            gap_recommendations = await gaps_task
+            yield _sse_event("enhancements", [rec.model_dump() for rec in gap_recommendations])
+
+            resume_result = ai_service.parse_anti_hallucination_resume("".join(chunks))
+            yield _sse_event("resume", {
+                "resume_content": resume_result,
+                "databank_utilization_report": resume_result.get("databank_utilization_report", {})
+            })
+        except (AIProviderError, AIProviderBusyError) as e:
+            # The response has already started, so the failure is reported in the stream
+            logger.exception("Streaming anti-hallucination resume failed")
+            yield _sse_event("error", {"detail": f"Failed to generate anti-hallucination resume: {e}"})
+        finally:
+            # Also runs when the client disconnects or the stream fails otherwise,
+            # so the gap analysis does not keep holding a provider slot
+            if not gaps_task.done():
+                gaps_task.cancel()
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+# Background jobs for the long-running anti-hallucination endpoints. The
+# client submits a job, gets an id back immediately and polls for the
+# result, so the request never waits through the whole LLM chain. Jobs run
+# in the worker process that accepted them and are kept for an hour.
+JOB_RESULT_TTL_SECONDS = 3600
+_jobs = TTLCache(maxsize=1024, ttl=JOB_RESULT_TTL_SECONDS)
+_jobs_lock = threading.Lock()
+
+JOB_HANDLERS = {
+    "validate-databank-coverage": validate_databank_coverage,
+    "suggest-databank-enhancements": suggest_databank_enhancements,
+    "generate-anti-hallucination-resume": generate_anti_hallucination_resume,
+}
+
+class JobSubmitResponse(BaseModel):
+    job_id: str
+    status: str
+
+class JobStatusResponse(BaseModel):
+    job_id: str
+    status: str  # pending, completed, failed
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+def _set_job(job_id: str, **fields) -> None:
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+        if job is not None:
+            _jobs[job_id] = {**job, **fields}
+
+async def _run_job(job_id: str, job_type: str, user_id: int, request: BaseModel) -> None:
+    """Run a job's endpoint with its own session, since the request's session is closed by now."""
+    handler = JOB_HANDLERS[job_type]
+    db = SessionLocal()
+    try:
+        user = await run_in_threadpool(db.get, User, user_id)
+        if user is None:
+            raise HTTPException(status_code=404, detail="User not found")
+        result = await handler(
+            request,
+            current_user=user,
+            ai_service=await get_ai_service(user),
+            db=db
+        )
+        _set_job(job_id, status="completed", result=result.model_dump())
+    except HTTPException as e:
+        _set_job(job_id, status="failed", error=str(e.detail))
     except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Failed to generate anti-hallucination resume: {str(e)}"
-        )
\ No newline at end of file
+        _set_job(job_id, status="failed", error=str(e))
+    finally:
+        await run_in_threadpool(db.close)
+
+def _submit_job(
+    job_type: str,
+    request: BaseModel,
+    background_tasks: BackgroundTasks,
+    current_user: User
+) -> Dict[str, str]:
+    """Queue the job and return its id. Poll GET /jobs/{job_id} for the result."""
+    # Check the user's API key up front, so a missing key fails now rather
+    # than when polled; the body was already validated by its route
+    _resolve_provider_key(current_user)
+
+    job_id = uuid.uuid4().hex
+    with _jobs_lock:
+        _jobs[job_id] = {"user_id": current_user.id, "status": "pending", "result": None, "error": None}
+    background_tasks.add_task(_run_job, job_id, job_type, current_user.id, request)
+
+    return {"job_id": job_id, "status": "pending"}
+
+@router.post("/jobs/validate-databank-coverage", response_model=JobSubmitResponse, status_code=status.HTTP_202_ACCEPTED)
+async def submit_validate_databank_coverage_job(
+    request: DatabankValidationRequest,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_user)
+):
+    """Queue validate-databank-coverage as a background job."""
+    return _submit_job("validate-databank-coverage", request, background_tasks, current_user)
+
+@router.post("/jobs/suggest-databank-enhancements", response_model=JobSubmitResponse, status_code=status.HTTP_202_ACCEPTED)
+async def submit_suggest_databank_enhancements_job(
+    request: DatabankEnhancementRequest,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_user)
+):
+    """Queue suggest-databank-enhancements as a background job."""
+    return _submit_job("suggest-databank-enhancements", request, background_tasks, current_user)
+
+@router.post("/jobs/generate-anti-hallucination-resume", response_model=JobSubmitResponse, status_code=status.HTTP_202_ACCEPTED)
+async def submit_generate_anti_hallucination_resume_job(
+    request: AntiHallucinationResumeRequest,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_user)
+):
+    """Queue generate-anti-hallucination-resume as a background job."""
+    return _submit_job("generate-anti-hallucination-resume", request, background_tasks, current_user)
+
+@router.get("/jobs/{job_id}", response_model=JobStatusResponse)
+def get_job(job_id: str, current_user: User = Depends(get_current_user)):
+    """Get the status of a background job and, once completed, its result."""
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+    if job is None or job["user_id"] != current_user.id:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return {
+        "job_id": job_id,
+        "status": job["status"],
+        "result": job["result"],
+        "error": job["error"]
+    }
\ No newline at end of file
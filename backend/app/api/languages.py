@@ -1,18 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from pydantic_core import to_json
 from typing import List, Optional, cast
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from ..schemas import language_schemas
 from ..models.models import Language as DBModelLanguage, User as DBModelUser
 from ..core.auth import get_current_user
+from ..core.crud import get_owned
+from ..core.databank_cache import invalidate_databank_on_write
 from ..core.database import get_db
 
 router = APIRouter(
-    tags=["Languages"]
+    tags=["Languages"],
+    dependencies=[Depends(invalidate_databank_on_write)]
 )
 
-def get_language_by_name_for_user(db: Session, name: str, user_id: int) -> Optional[DBModelLanguage]:
-    return db.query(DBModelLanguage).filter(DBModelLanguage.name == name, DBModelLanguage.user_id == user_id).first()
+# Columns of the Language response schema, selected directly by the list endpoint
+LANGUAGE_LIST_COLUMNS = (
+    DBModelLanguage.id,
+    DBModelLanguage.user_id,
+    DBModelLanguage.name,
+    DBModelLanguage.proficiency,
+)
+
+def get_language_for_user(db: Session, language_id: int, user_id: int) -> Optional[DBModelLanguage]:
+    return get_owned(db, DBModelLanguage, language_id, user_id)
 
 @router.post("/", response_model=language_schemas.Language, status_code=status.HTTP_201_CREATED)
 def create_language(
@@ -22,18 +36,18 @@ def create_language(
 ):
     """Create a new language for the current user."""
     user_id_actual = cast(int, current_user.id)
-    existing_language = get_language_by_name_for_user(db, name=language_in.name, user_id=user_id_actual)
-    if existing_language:
+    db_language_data = language_in.model_dump()
+    db_language = DBModelLanguage(**db_language_data, user_id=user_id_actual)
+    db.add(db_language)
+    try:
+        db.commit()
+    except IntegrityError:
+        # uq_language_user_name rejects a duplicate name for this user
+        db.rollback()
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Language with this name already exists for the current user"
         )
-    
-    db_language_data = language_in.model_dump()
-    db_language = DBModelLanguage(**db_language_data, user_id=user_id_actual)
-    db.add(db_language)
-    db.commit()
-    db.refresh(db_language)
     return db_language
 
 @router.get("/", response_model=List[language_schemas.Language])
@@ -41,12 +55,30 @@ def get_languages(
     current_user: DBModelUser = Depends(get_current_user),
     db: Session = Depends(get_db),
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    cursor: Optional[int] = None
 ):
-    """Get all languages for the current user."""
+    """
+    Get all languages for the current user, in creation order.
+    Pass the X-Next-Cursor header of the previous page as cursor to fetch the
+    next page without an OFFSET scan; the header is absent on the last page.
+    """
     user_id_actual = cast(int, current_user.id)
-    languages = db.query(DBModelLanguage).filter(DBModelLanguage.user_id == user_id_actual).offset(skip).limit(limit).all()
-    return languages
+    query = select(*LANGUAGE_LIST_COLUMNS)\
+        .where(DBModelLanguage.user_id == user_id_actual)\
+        .order_by(DBModelLanguage.id)
+    if cursor is not None:
+        query = query.where(DBModelLanguage.id > cursor)
+    else:
+        query = query.offset(skip)
+
+    rows = db.execute(query.limit(limit)).mappings().all()
+    # The rows come straight from the database, so they are serialized as-is
+    # rather than validated again against response_model (kept for the docs).
+    response = Response(content=to_json([dict(row) for row in rows]), media_type="application/json")
+    if rows and len(rows) == limit:
+        response.headers["X-Next-Cursor"] = str(rows[-1]["id"])
+    return response
 
 @router.get("/{language_id}", response_model=language_schemas.Language)
 def get_language(
@@ -56,7 +88,7 @@ def get_language(
 ):
     """Get a specific language by ID."""
     user_id_actual = cast(int, current_user.id)
-    db_language = db.query(DBModelLanguage).filter(DBModelLanguage.id == language_id, DBModelLanguage.user_id == user_id_actual).first()
+    db_language = get_language_for_user(db, language_id=language_id, user_id=user_id_actual)
     if not db_language:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Language not found or not owned by user")
     return db_language
@@ -70,25 +102,22 @@ def update_language(
 ):
     """Update a specific language by ID."""
     user_id_actual = cast(int, current_user.id)
-    db_language = db.query(DBModelLanguage).filter(DBModelLanguage.id == language_id, DBModelLanguage.user_id == user_id_actual).first()
+    db_language = get_language_for_user(db, language_id=language_id, user_id=user_id_actual)
     if not db_language:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Language not found or not owned by user")
     
     update_data = language_update_in.model_dump(exclude_unset=True)
-    
-    if 'name' in update_data and update_data['name'] != db_language.name:
-        existing_language_with_new_name = get_language_by_name_for_user(db, name=update_data['name'], user_id=user_id_actual)
-        if existing_language_with_new_name:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail="Another language with this name already exists for the current user"
-            )
-
     for key, value in update_data.items():
         setattr(db_language, key, value)
     
-    db.commit()
-    db.refresh(db_language)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Another language with this name already exists for the current user"
+        )
     return db_language
 
 @router.delete("/{language_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -99,7 +128,7 @@ def delete_language(
 ):
     """Delete a specific language by ID."""
     user_id_actual = cast(int, current_user.id)
-    db_language = db.query(DBModelLanguage).filter(DBModelLanguage.id == language_id, DBModelLanguage.user_id == user_id_actual).first()
+    db_language = get_language_for_user(db, language_id=language_id, user_id=user_id_actual)
     if not db_language:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Language not found or not owned by user")
     
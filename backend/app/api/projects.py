@@ -1,18 +1,37 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from pydantic_core import to_json
 from typing import List, Optional, cast
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from ..schemas import project_schemas
 from ..models.models import Project as DBModelProject, User as DBModelUser
 from ..core.auth import get_current_user
+from ..core.crud import get_owned
+from ..core.databank_cache import invalidate_databank_on_write
 from ..core.database import get_db
 
 router = APIRouter(
-    tags=["Projects"]
+    tags=["Projects"],
+    dependencies=[Depends(invalidate_databank_on_write)]
 )
 
-def get_project_by_name_for_user(db: Session, name: str, user_id: int) -> Optional[DBModelProject]:
-    return db.query(DBModelProject).filter(DBModelProject.name == name, DBModelProject.user_id == user_id).first()
+# Columns of the Project response schema, selected directly by the list endpoint
+PROJECT_LIST_COLUMNS = (
+    DBModelProject.id,
+    DBModelProject.user_id,
+    DBModelProject.name,
+    DBModelProject.description,
+    DBModelProject.url,
+    DBModelProject.start_date,
+    DBModelProject.end_date,
+    DBModelProject.is_current,
+    DBModelProject.technologies,
+)
+
+def get_project_for_user(db: Session, project_id: int, user_id: int) -> Optional[DBModelProject]:
+    return get_owned(db, DBModelProject, project_id, user_id)
 
 @router.post("/", response_model=project_schemas.Project, status_code=status.HTTP_201_CREATED)
 def create_project(
@@ -22,18 +41,18 @@ def create_project(
 ):
     """Create a new project for the current user."""
     user_id_actual = cast(int, current_user.id)
-    existing_project = get_project_by_name_for_user(db, name=project_in.name, user_id=user_id_actual)
-    if existing_project:
+    db_project_data = project_in.model_dump()
+    db_project = DBModelProject(**db_project_data, user_id=user_id_actual)
+    db.add(db_project)
+    try:
+        db.commit()
+    except IntegrityError:
+        # uq_project_user_name rejects a duplicate name for this user
+        db.rollback()
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Project with this name already exists for the current user"
         )
-    
-    db_project_data = project_in.model_dump()
-    db_project = DBModelProject(**db_project_data, user_id=user_id_actual)
-    db.add(db_project)
-    db.commit()
-    db.refresh(db_project)
     return db_project
 
 @router.get("/", response_model=List[project_schemas.Project])
@@ -41,12 +60,30 @@ def get_projects(
     current_user: DBModelUser = Depends(get_current_user),
     db: Session = Depends(get_db),
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    cursor: Optional[int] = None
 ):
-    """Get all projects for the current user."""
+    """
+    Get all projects for the current user, in creation order.
+    Pass the X-Next-Cursor header of the previous page as cursor to fetch the
+    next page without an OFFSET scan; the header is absent on the last page.
+    """
     user_id_actual = cast(int, current_user.id)
-    projects = db.query(DBModelProject).filter(DBModelProject.user_id == user_id_actual).offset(skip).limit(limit).all()
-    return projects
+    query = select(*PROJECT_LIST_COLUMNS)\
+        .where(DBModelProject.user_id == user_id_actual)\
+        .order_by(DBModelProject.id)
+    if cursor is not None:
+        query = query.where(DBModelProject.id > cursor)
+    else:
+        query = query.offset(skip)
+
+    rows = db.execute(query.limit(limit)).mappings().all()
+    # The rows come straight from the database, so they are serialized as-is
+    # rather than validated again against response_model (kept for the docs).
+    response = Response(content=to_json([dict(row) for row in rows]), media_type="application/json")
+    if rows and len(rows) == limit:
+        response.headers["X-Next-Cursor"] = str(rows[-1]["id"])
+    return response
 
 @router.get("/{project_id}", response_model=project_schemas.Project)
 def get_project(
@@ -56,7 +93,7 @@ def get_project(
 ):
     """Get a specific project by ID."""
     user_id_actual = cast(int, current_user.id)
-    db_project = db.query(DBModelProject).filter(DBModelProject.id == project_id, DBModelProject.user_id == user_id_actual).first()
+    db_project = get_project_for_user(db, project_id=project_id, user_id=user_id_actual)
     if not db_project:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found or not owned by user")
     return db_project
@@ -70,25 +107,22 @@ def update_project(
 ):
     """Update a specific project by ID."""
     user_id_actual = cast(int, current_user.id)
-    db_project = db.query(DBModelProject).filter(DBModelProject.id == project_id, DBModelProject.user_id == user_id_actual).first()
+    db_project = get_project_for_user(db, project_id=project_id, user_id=user_id_actual)
     if not db_project:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found or not owned by user")
     
     update_data = project_update_in.model_dump(exclude_unset=True)
-    
-    if 'name' in update_data and update_data['name'] != db_project.name:
-        existing_project_with_new_name = get_project_by_name_for_user(db, name=update_data['name'], user_id=user_id_actual)
-        if existing_project_with_new_name:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail="Another project with this name already exists for the current user"
-            )
-
     for key, value in update_data.items():
         setattr(db_project, key, value)
     
-    db.commit()
-    db.refresh(db_project)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Another project with this name already exists for the current user"
+        )
     return db_project
 
 @router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -99,7 +133,7 @@ def delete_project(
 ):
     """Delete a specific project by ID."""
     user_id_actual = cast(int, current_user.id)
-    db_project = db.query(DBModelProject).filter(DBModelProject.id == project_id, DBModelProject.user_id == user_id_actual).first()
+    db_project = get_project_for_user(db, project_id=project_id, user_id=user_id_actual)
     if not db_project:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found or not owned by user")
     
@@ -1,11 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, TypeAdapter
 from typing import List, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, load_only
 from datetime import datetime
 
 from ..models.models import Resume, User
 from ..core.auth import get_current_user
+from ..core.crud import NO_LAZY_LOADS, json_list_response
 from ..core.database import get_db
 from ..services.resume_generator import ResumeGenerator, ResumeFormat
 
@@ -62,8 +63,8 @@ class ResumeUpdate(BaseModel):
 class ResumeResponse(BaseModel):
     id: int
     title: str
-    created_at: str
-    last_modified: str
+    created_at: datetime
+    last_modified: datetime
     format: str
     job_title: Optional[str] = None
     company_name: Optional[str] = None
@@ -79,8 +80,19 @@ class ResumeResponse(BaseModel):
     include_certifications: bool
     include_languages: bool
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
+
+# Columns read by ResumeResponse; listing resumes skips the generated content,
+# the job description and the JSON-LD, which can each be large
+RESUME_RESPONSE_COLUMNS = (
+    Resume.id, Resume.title, Resume.created_at, Resume.last_modified, Resume.format,
+    Resume.job_title, Resume.company_name, Resume.ats_score, Resume.ats_feedback,
+    Resume.include_summary, Resume.include_skills, Resume.include_experience,
+    Resume.include_education, Resume.include_projects, Resume.include_certifications,
+    Resume.include_languages
+)
+
+resume_list_adapter = TypeAdapter(List[ResumeResponse])
 
 @router.post("/", response_model=ResumeResponse)
 def create_resume(
@@ -121,6 +133,8 @@ def create_resume(
             include_languages=resume.include_languages
         )
         return new_resume
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -133,10 +147,11 @@ def get_resumes(
 ):
     """Get all resumes for the current user."""
     resumes = db.query(Resume)\
+        .options(load_only(*RESUME_RESPONSE_COLUMNS), NO_LAZY_LOADS)\
         .filter(Resume.user_id == current_user.id)\
         .order_by(Resume.created_at.desc())\
         .offset(skip).limit(limit).all()
-    return resumes
+    return json_list_response(resume_list_adapter, resumes)
 
 @router.get("/{resume_id}", response_model=ResumeResponse)
 def get_resume(
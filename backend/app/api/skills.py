@@ -1,18 +1,26 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from pydantic import TypeAdapter
 from typing import List, Optional, cast
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from ..schemas import skill_schemas
-from ..models.models import Skill as DBModelSkill, User as DBModelUser, ExperienceLevel
+from ..models.models import Skill as DBModelSkill, User as DBModelUser, ExperienceLevel, skill_resume_association
 from ..core.auth import get_current_user
+from ..core.crud import NO_LAZY_LOADS, get_owned, json_list_response
+from ..core.databank_cache import invalidate_databank_on_write
 from ..core.database import get_db
 
+skill_list_adapter = TypeAdapter(List[skill_schemas.Skill])
+
 router = APIRouter(
-    tags=["Skills"]
+    tags=["Skills"],
+    dependencies=[Depends(invalidate_databank_on_write)]
 )
 
-def get_skill_by_name_for_user(db: Session, name: str, user_id: int) -> Optional[DBModelSkill]:
-    return db.query(DBModelSkill).filter(DBModelSkill.name == name, DBModelSkill.user_id == user_id).first()
+def get_skill_for_user(db: Session, skill_id: int, user_id: int) -> Optional[DBModelSkill]:
+    return get_owned(db, DBModelSkill, skill_id, user_id)
 
 @router.post("/", response_model=skill_schemas.Skill, status_code=status.HTTP_201_CREATED)
 def create_skill(
@@ -22,18 +30,18 @@ def create_skill(
 ):
     """Create a new skill for the current user."""
     user_id_actual = cast(int, current_user.id)
-    existing_skill = get_skill_by_name_for_user(db, name=skill_in.name, user_id=user_id_actual)
-    if existing_skill:
+    db_skill_data = skill_in.model_dump()
+    db_skill = DBModelSkill(**db_skill_data, user_id=user_id_actual)
+    db.add(db_skill)
+    try:
+        db.commit()
+    except IntegrityError:
+        # uq_skill_user_name rejects a duplicate name for this user
+        db.rollback()
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Skill with this name already exists for the current user"
         )
-    
-    db_skill_data = skill_in.model_dump()
-    db_skill = DBModelSkill(**db_skill_data, user_id=user_id_actual)
-    db.add(db_skill)
-    db.commit()
-    db.refresh(db_skill)
     return db_skill
 
 @router.get("/", response_model=List[skill_schemas.Skill])
@@ -46,13 +54,13 @@ def get_skills(
 ):
     """Get all skills for the current user with optional filtering."""
     user_id_actual = cast(int, current_user.id)
-    query = db.query(DBModelSkill).filter(DBModelSkill.user_id == user_id_actual)
+    query = db.query(DBModelSkill).options(NO_LAZY_LOADS).filter(DBModelSkill.user_id == user_id_actual)
     
     if category:
         query = query.filter(DBModelSkill.category == category)
     
-    skills = query.offset(skip).limit(limit).all()
-    return skills
+    skills = query.order_by(DBModelSkill.id).offset(skip).limit(limit).all()
+    return json_list_response(skill_list_adapter, skills)
 
 @router.get("/{skill_id}", response_model=skill_schemas.Skill)
 def get_skill(
@@ -62,7 +70,7 @@ def get_skill(
 ):
     """Get a specific skill by ID."""
     user_id_actual = cast(int, current_user.id)
-    db_skill = db.query(DBModelSkill).filter(DBModelSkill.id == skill_id, DBModelSkill.user_id == user_id_actual).first()
+    db_skill = get_skill_for_user(db, skill_id=skill_id, user_id=user_id_actual)
     if not db_skill:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Skill not found or not owned by user")
     return db_skill
@@ -76,25 +84,31 @@ def update_skill(
 ):
     """Update a specific skill by ID."""
     user_id_actual = cast(int, current_user.id)
-    db_skill = db.query(DBModelSkill).filter(DBModelSkill.id == skill_id, DBModelSkill.user_id == user_id_actual).first()
-    if not db_skill:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Skill not found or not owned by user")
-    
     update_data = skill_update_in.model_dump(exclude_unset=True)
-    
-    if 'name' in update_data and update_data['name'] != db_skill.name:
-        existing_skill_with_new_name = get_skill_by_name_for_user(db, name=update_data['name'], user_id=user_id_actual)
-        if existing_skill_with_new_name:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail="Another skill with this name already exists for the current user"
-            )
+    if not update_data:
+        db_skill = get_skill_for_user(db, skill_id=skill_id, user_id=user_id_actual)
+        if not db_skill:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Skill not found or not owned by user")
+        return db_skill
 
-    for key, value in update_data.items():
-        setattr(db_skill, key, value)
-    
-    db.commit()
-    db.refresh(db_skill)
+    # Ownership check and update in one statement
+    stmt = (
+        update(DBModelSkill)
+        .where(DBModelSkill.id == skill_id, DBModelSkill.user_id == user_id_actual)
+        .values(**update_data)
+        .returning(DBModelSkill)
+    )
+    try:
+        db_skill = db.execute(stmt).scalar_one_or_none()
+        if not db_skill:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Skill not found or not owned by user")
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Another skill with this name already exists for the current user"
+        )
     return db_skill
 
 @router.delete("/{skill_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -105,10 +119,18 @@ def delete_skill(
 ):
     """Delete a specific skill by ID."""
     user_id_actual = cast(int, current_user.id)
-    db_skill = db.query(DBModelSkill).filter(DBModelSkill.id == skill_id, DBModelSkill.user_id == user_id_actual).first()
-    if not db_skill:
+    owned_skill = (DBModelSkill.id == skill_id, DBModelSkill.user_id == user_id_actual)
+    # Unlink it from resumes first, as the ORM delete did; the subquery keeps
+    # this to the current user's skill
+    db.execute(
+        delete(skill_resume_association)
+        .where(skill_resume_association.c.skill_id.in_(
+            select(DBModelSkill.id).where(*owned_skill)
+        ))
+    )
+    result = db.execute(delete(DBModelSkill).where(*owned_skill))
+    if result.rowcount == 0:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Skill not found or not owned by user")
     
-    db.delete(db_skill)
     db.commit()
     return None
\ No newline at end of file
@@ -1,12 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import func, or_
 from sqlalchemy.orm import Session
 
 from ..core.auth import get_current_user
+from ..core.databank_cache import invalidate_databank_on_write
 from ..core.database import get_db
 from ..models.models import User
 
-router = APIRouter()
+router = APIRouter(dependencies=[Depends(invalidate_databank_on_write)])
 
 class ProfileUpdate(BaseModel):
     username: str = None
@@ -17,8 +19,7 @@ class ProfileResponse(BaseModel):
     username: str
     email: str
     
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 @router.get("/me", response_model=ProfileResponse)
 def get_profile(current_user: User = Depends(get_current_user)):
@@ -32,20 +33,30 @@ def update_profile(
     db: Session = Depends(get_db)
 ):
     """Update the current user's profile."""
-    # Check username availability if being updated
-    if profile_data.username and profile_data.username != current_user.username:
-        db_user = db.query(User).filter(User.username == profile_data.username).first()
-        if db_user:
-            raise HTTPException(status_code=400, detail="Username already taken")
-        current_user.username = profile_data.username
+    # Check username and email availability in one query.
+    # Emails are compared case-insensitively, as at login
+    update_username = bool(profile_data.username) and profile_data.username != current_user.username
+    update_email = bool(profile_data.email) and profile_data.email.lower() != current_user.email.lower()
+    conflict_filters = []
+    if update_username:
+        conflict_filters.append(User.username == profile_data.username)
+    if update_email:
+        conflict_filters.append(func.lower(User.email) == profile_data.email.lower())
     
-    # Check email availability if being updated
-    if profile_data.email and profile_data.email != current_user.email:
-        db_user = db.query(User).filter(User.email == profile_data.email).first()
-        if db_user:
+    if conflict_filters:
+        conflicts = db.query(User.username, User.email).filter(
+            User.id != current_user.id,
+            or_(*conflict_filters)
+        ).all()
+        if update_username and any(username == profile_data.username for username, _ in conflicts):
+            raise HTTPException(status_code=400, detail="Username already taken")
+        if update_email and any(email.lower() == profile_data.email.lower() for _, email in conflicts):
             raise HTTPException(status_code=400, detail="Email already registered")
+    
+    if update_username:
+        current_user.username = profile_data.username
+    if update_email:
         current_user.email = profile_data.email
     
     db.commit()
-    db.refresh(current_user)
     return current_user
\ No newline at end of file
@@ -1,14 +1,17 @@
 from datetime import date
 from fastapi import APIRouter, Depends, HTTPException, status
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, TypeAdapter
 from typing import List, Optional
+from sqlalchemy import delete, select, update
 from sqlalchemy.orm import Session
 
-from ..models.models import WorkExperience, User
+from ..models.models import WorkExperience, User, work_experience_resume_association
 from ..core.auth import get_current_user
+from ..core.crud import NO_LAZY_LOADS, get_owned, json_list_response
+from ..core.databank_cache import invalidate_databank_on_write
 from ..core.database import get_db
 
-router = APIRouter()
+router = APIRouter(dependencies=[Depends(invalidate_databank_on_write)])
 
 class WorkExperienceBase(BaseModel):
     company: str
@@ -43,8 +46,12 @@ class WorkExperienceResponse(WorkExperienceBase):
     id: int
     user_id: int
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
+
+work_experience_list_adapter = TypeAdapter(List[WorkExperienceResponse])
+
+def get_work_experience_for_user(db: Session, work_experience_id: int, user_id: int) -> Optional[WorkExperience]:
+    return get_owned(db, WorkExperience, work_experience_id, user_id)
 
 @router.post("/", response_model=WorkExperienceResponse)
 def create_work_experience(
@@ -62,12 +69,11 @@ def create_work_experience(
     
     # Create work experience object
     db_work_experience = WorkExperience(
-        **work_experience.dict(),
+        **work_experience.model_dump(),
         user_id=current_user.id
     )
     db.add(db_work_experience)
     db.commit()
-    db.refresh(db_work_experience)
     return db_work_experience
 
 @router.get("/", response_model=List[WorkExperienceResponse])
@@ -79,10 +85,11 @@ def get_work_experiences(
 ):
     """Get all work experiences for the current user."""
     work_experiences = db.query(WorkExperience)\
+        .options(NO_LAZY_LOADS)\
         .filter(WorkExperience.user_id == current_user.id)\
         .order_by(WorkExperience.start_date.desc())\
         .offset(skip).limit(limit).all()
-    return work_experiences
+    return json_list_response(work_experience_list_adapter, work_experiences)
 
 @router.get("/{work_experience_id}", response_model=WorkExperienceResponse)
 def get_work_experience(
@@ -91,10 +98,7 @@ def get_work_experience(
     db: Session = Depends(get_db)
 ):
     """Get a specific work experience by ID."""
-    work_experience = db.query(WorkExperience).filter(
-        WorkExperience.id == work_experience_id,
-        WorkExperience.user_id == current_user.id
-    ).first()
+    work_experience = get_work_experience_for_user(db, work_experience_id, current_user.id)
     if not work_experience:
         raise HTTPException(status_code=404, detail="Work experience not found")
     return work_experience
@@ -107,15 +111,8 @@ def update_work_experience(
     db: Session = Depends(get_db)
 ):
     """Update a specific work experience by ID."""
-    db_work_experience = db.query(WorkExperience).filter(
-        WorkExperience.id == work_experience_id,
-        WorkExperience.user_id == current_user.id
-    ).first()
-    if not db_work_experience:
-        raise HTTPException(status_code=404, detail="Work experience not found")
-    
     # Update only the fields that were provided
-    update_data = work_experience.dict(exclude_unset=True)
+    update_data = work_experience.model_dump(exclude_unset=True)
     
     # Validate that if is_current is being set to True, end_date should be None
     if update_data.get('is_current') and update_data.get('end_date'):
@@ -124,11 +121,23 @@ def update_work_experience(
             detail="Current job should not have an end date"
         )
     
-    for key, value in update_data.items():
-        setattr(db_work_experience, key, value)
+    if not update_data:
+        db_work_experience = get_work_experience_for_user(db, work_experience_id, current_user.id)
+        if not db_work_experience:
+            raise HTTPException(status_code=404, detail="Work experience not found")
+        return db_work_experience
+    
+    # Ownership check and update in one statement
+    db_work_experience = db.execute(
+        update(WorkExperience)
+        .where(WorkExperience.id == work_experience_id, WorkExperience.user_id == current_user.id)
+        .values(**update_data)
+        .returning(WorkExperience)
+    ).scalar_one_or_none()
+    if not db_work_experience:
+        raise HTTPException(status_code=404, detail="Work experience not found")
     
     db.commit()
-    db.refresh(db_work_experience)
     return db_work_experience
 
 @router.delete("/{work_experience_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -138,13 +147,17 @@ def delete_work_experience(
     db: Session = Depends(get_db)
 ):
     """Delete a specific work experience by ID."""
-    db_work_experience = db.query(WorkExperience).filter(
-        WorkExperience.id == work_experience_id,
-        WorkExperience.user_id == current_user.id
-    ).first()
-    if not db_work_experience:
+    owned_experience = (WorkExperience.id == work_experience_id, WorkExperience.user_id == current_user.id)
+    # Unlink it from resumes first, as the ORM delete did
+    db.execute(
+        delete(work_experience_resume_association)
+        .where(work_experience_resume_association.c.work_experience_id.in_(
+            select(WorkExperience.id).where(*owned_experience)
+        ))
+    )
+    result = db.execute(delete(WorkExperience).where(*owned_experience))
+    if result.rowcount == 0:
         raise HTTPException(status_code=404, detail="Work experience not found")
     
-    db.delete(db_work_experience)
     db.commit()
     return None
\ No newline at end of file
@@ -1,29 +1,67 @@
+import hashlib
+import logging
 import os
+import threading
+import time
 from datetime import datetime, timedelta
 from typing import Optional
 
+from cachetools import TTLCache
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, load_only
 from sqlalchemy import func
 
 from ..models.models import User
 from ..core.database import get_db
 
+logger = logging.getLogger(__name__)
+
 # Configuration
 SECRET_KEY = os.getenv("SECRET_KEY", "generate_a_secure_secret_key")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 10080 # 7 days for testing, was 30
 
-# Password handling
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password handling. bcrypt costs tens of milliseconds of CPU per hash, so
+# the endpoints that hash or verify passwords are plain `def` and run on the
+# threadpool; bcrypt releases the GIL, so concurrent logins hash in parallel.
+# The work factor is pinned (passlib's default is 12) so it does not change
+# with library upgrades; raising it only affects newly created hashes.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
 # This scheme is for the /api/auth/token endpoint (OAuth2 password flow)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token") 
 # This scheme is for general Bearer token authentication for other endpoints
 http_bearer_scheme = HTTPBearer()
 
+# Cache of verified tokens, keyed by SHA-256 of the raw token. Maps to
+# (user_id, email, exp) so repeat requests skip the JWT decode and the lookup
+# by email. A hit still loads the user by primary key and compares the email,
+# so a deleted user or changed email takes effect immediately; the TTL only
+# bounds memory and is never allowed to outlive the token's own exp.
+# The user's columns are deliberately not cached with the token: the users and
+# api_keys routers modify and commit the returned instance, which must belong
+# to the request's session, and an in-process cache could not be invalidated
+# from the other workers, which would keep serving a replaced API key.
+TOKEN_CACHE_TTL_SECONDS = 60
+_token_cache = TTLCache(maxsize=10000, ttl=TOKEN_CACHE_TTL_SECONDS)
+_token_cache_lock = threading.Lock()
+
+# Columns loaded for the authenticated user on every request. The password
+# hash and resume profile fields are deferred until something reads them.
+CURRENT_USER_COLUMNS = (
+    User.id,
+    User.email,
+    User.username,
+    User.preferred_ai_provider,
+    User.api_key_openai,
+    User.api_key_anthropic,
+    User.api_key_google,
+)
+
 def verify_password(plain_password, hashed_password):
     """Verify a password against a hash."""
     return pwd_context.verify(plain_password, hashed_password)
@@ -35,31 +73,28 @@ def get_password_hash(password):
 def authenticate_user(db: Session, email: str, password: str):
     """Authenticate a user by email and password."""
     cleaned_email = email.strip()
-    print(f"Attempting to authenticate user with cleaned email: {cleaned_email}")  # DEBUG
     
-    user = db.query(User).filter(func.lower(User.email) == func.lower(cleaned_email)).first()
+    # Matches ix_users_email_lower, so this is an index lookup rather than a scan
+    user = db.query(User).filter(func.lower(User.email) == cleaned_email.lower()).first()
     
     if not user:
-        print(f"User with cleaned email {cleaned_email} (case-insensitive) not found.")  # DEBUG
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Login failed: no user with email %s", cleaned_email)
         return False
-    
-    print(f"User found: {user.email} (DB actual: {user.email}), Hashed password from DB: {user.hashed_password}")  # DEBUG
 
     # If the user has no hashed password (e.g., created via Firebase or other external provider),
     # they cannot be authenticated using this local password verification method.
     if user.hashed_password is None:
-        print(f"User {cleaned_email} has no local password set. Cannot authenticate via /token endpoint.") # DEBUG
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Login failed: user %s has no local password", cleaned_email)
         return False
 
     # Proceed with password verification only if a hashed_password exists.
-    password_verified = verify_password(password, user.hashed_password)
-    print(f"Password verification result for {cleaned_email}: {password_verified}")  # DEBUG
-    
-    if not password_verified:
-        print(f"Password verification failed for user {cleaned_email}.")  # DEBUG
+    if not verify_password(password, user.hashed_password):
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Login failed: wrong password for user %s", cleaned_email)
         return False
         
-    print(f"User {cleaned_email} authenticated successfully.")  # DEBUG
     return user
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
@@ -79,6 +114,17 @@ def get_current_user(db: Session = Depends(get_db), auth_credentials: HTTPAuthor
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+    cache_key = hashlib.sha256(token.encode()).digest()
+    with _token_cache_lock:
+        cached = _token_cache.get(cache_key)
+    if cached is not None:
+        user_id, email, exp = cached
+        if exp is None or exp > time.time():
+            user = db.get(User, user_id, options=[load_only(*CURRENT_USER_COLUMNS)])
+            if user is None or user.email != email:
+                raise credentials_exception
+            return user
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         email_from_payload = payload.get("sub") 
@@ -88,7 +134,10 @@ def get_current_user(db: Session = Depends(get_db), auth_credentials: HTTPAuthor
     except JWTError:
         raise credentials_exception
     
-    user = db.query(User).filter(User.email == email).first()
+    user = db.query(User).options(load_only(*CURRENT_USER_COLUMNS)).filter(User.email == email).first()
     if user is None:
         raise credentials_exception
+
+    with _token_cache_lock:
+        _token_cache[cache_key] = (user.id, email, payload.get("exp"))
     return user
\ No newline at end of file
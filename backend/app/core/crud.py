@@ -0,0 +1,27 @@
+from typing import Any, Optional, Sequence, Type, TypeVar
+
+from fastapi import Response
+from pydantic import TypeAdapter
+from sqlalchemy.orm import Session, raiseload
+
+# Helpers shared by the databank routers (skills, work experiences, ...)
+
+ModelT = TypeVar("ModelT")
+
+# Loader option for list queries whose response has no relationship fields:
+# a lazy load while serializing them would be a bug, so it raises instead
+NO_LAZY_LOADS = raiseload("*")
+
+def get_owned(db: Session, model: Type[ModelT], item_id: int, user_id: int) -> Optional[ModelT]:
+    """
+    Fetch a row by primary key, only if it belongs to the user. The lookup is
+    served from the session's identity map when the row is already loaded.
+    """
+    item = db.get(model, item_id)
+    if item is None or item.user_id != user_id:
+        return None
+    return item
+
+def json_list_response(adapter: TypeAdapter, rows: Sequence[Any]) -> Response:
+    """Validate and serialize a page of rows with a list TypeAdapter, in one pydantic-core pass."""
+    return Response(content=adapter.dump_json(adapter.validate_python(rows)), media_type="application/json")
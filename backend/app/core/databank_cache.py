@@ -0,0 +1,38 @@
+import os
+import threading
+from typing import Any, Dict, Optional
+
+from cachetools import TTLCache
+from fastapi import Depends, Request
+
+from ..models.models import User
+from ..core.auth import get_current_user
+
+# Per-user databank snapshots for the job analysis workflow (validate ->
+# enhance -> generate), which reads the same databank several times in a row.
+# Entries are dropped whenever the user writes to a databank router. The cache
+# is per process, so other workers may serve a snapshot up to the TTL old.
+DATABANK_CACHE_TTL_SECONDS = int(os.getenv("DATABANK_CACHE_TTL_SECONDS", "300"))
+_databank_cache = TTLCache(maxsize=1024, ttl=DATABANK_CACHE_TTL_SECONDS)
+_databank_cache_lock = threading.Lock()
+
+READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+def get_cached_databank(user_id: int, variant: str) -> Optional[Dict[str, Any]]:
+    """Return the cached databank of the given variant (e.g. "complete"), if any."""
+    with _databank_cache_lock:
+        return _databank_cache.get(user_id, {}).get(variant)
+
+def cache_databank(user_id: int, variant: str, databank: Dict[str, Any]) -> None:
+    with _databank_cache_lock:
+        _databank_cache[user_id] = {**_databank_cache.get(user_id, {}), variant: databank}
+
+def invalidate_user_databank(user_id: int) -> None:
+    with _databank_cache_lock:
+        _databank_cache.pop(user_id, None)
+
+def invalidate_databank_on_write(request: Request, current_user: User = Depends(get_current_user)):
+    """Router dependency that drops the user's cached databank after any write request."""
+    yield
+    if request.method not in READ_METHODS:
+        invalidate_user_databank(current_user.id)
@@ -0,0 +1,64 @@
+import hashlib
+import os
+import threading
+from typing import Optional
+
+from cachetools import TTLCache
+from cryptography.fernet import Fernet, InvalidToken
+from sqlalchemy import String
+from sqlalchemy.types import TypeDecorator
+
+# Key used to encrypt secrets stored in the database (e.g. users' AI provider keys).
+# Generate one with Fernet.generate_key(). There is deliberately no fallback:
+# a key derived from a default or shared setting would not protect anything.
+API_KEY_ENCRYPTION_KEY = os.getenv("API_KEY_ENCRYPTION_KEY")
+
+if not API_KEY_ENCRYPTION_KEY:
+    raise ValueError("API_KEY_ENCRYPTION_KEY environment variable not set. Please add a key generated with `python -c \"from cryptography.fernet import Fernet; print(Fernet.generate_key().decode())\"` to the .env file in the backend directory")
+
+_fernet = Fernet(API_KEY_ENCRYPTION_KEY.encode())
+
+# Decrypted values, keyed by SHA-256 of the ciphertext so a key read on every
+# request is not decrypted every time. The TTL bounds how long a plaintext
+# stays in memory after it was last loaded.
+DECRYPT_CACHE_TTL_SECONDS = 300
+_decrypt_cache = TTLCache(maxsize=1024, ttl=DECRYPT_CACHE_TTL_SECONDS)
+_decrypt_cache_lock = threading.Lock()
+
+def encrypt_value(value: str) -> str:
+    return _fernet.encrypt(value.encode()).decode()
+
+def decrypt_value(value: str) -> str:
+    """
+    Decrypt a stored value. Raises ValueError if it was not encrypted with
+    API_KEY_ENCRYPTION_KEY; plaintext rows are encrypted by migration 0004.
+    """
+    cache_key = hashlib.sha256(value.encode()).digest()
+    with _decrypt_cache_lock:
+        plaintext = _decrypt_cache.get(cache_key)
+    if plaintext is not None:
+        return plaintext
+
+    try:
+        plaintext = _fernet.decrypt(value.encode()).decode()
+    except InvalidToken as e:
+        raise ValueError("Stored value could not be decrypted with API_KEY_ENCRYPTION_KEY") from e
+    with _decrypt_cache_lock:
+        _decrypt_cache[cache_key] = plaintext
+    return plaintext
+
+class EncryptedString(TypeDecorator):
+    """String column that is Fernet-encrypted at rest and decrypted on load."""
+
+    impl = String
+    cache_ok = True
+
+    def process_bind_param(self, value: Optional[str], dialect) -> Optional[str]:
+        if value is None:
+            return None
+        return encrypt_value(value)
+
+    def process_result_value(self, value: Optional[str], dialect) -> Optional[str]:
+        if value is None:
+            return None
+        return decrypt_value(value)
@@ -2,58 +2,57 @@ import firebase_admin
 from firebase_admin import credentials, auth
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+import asyncio
+import hashlib
+import logging
 import os
+import threading
+import time
 
-def init_firebase():
-    """Initializes the Firebase Admin SDK."""
-    if firebase_admin._apps: # Check if already initialized
-        print("Firebase Admin SDK already initialized.")
-        return
+from cachetools import TLRUCache
 
-    cred_path_env = os.getenv('GOOGLE_APPLICATION_CREDENTIALS')
-    # Path relative to the backend directory, assuming the key is in 'backend/'
-    default_cred_path_relative_to_backend = "tailoresume-firebase-adminsdk-fbsvc-3d6b16b04c.json"
-    # Construct absolute path from the perspective of this file (app/core/firebase_auth.py)
-    # backend_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
-    # default_cred_path_abs = os.path.join(backend_dir, default_cred_path_relative_to_backend)
-    
-    # Simpler path construction assuming the service key is in the `backend` directory
-    # and this script is in `backend/app/core`
-    # So, ../../ goes from app/core -> app -> backend
-    current_file_dir = os.path.dirname(os.path.abspath(__file__))
-    service_key_path = os.path.join(current_file_dir, "..", "..", "tailoresume-firebase-adminsdk-fbsvc-3d6b16b04c.json")
+logger = logging.getLogger(__name__)
 
-    cred = None
-    initialized_by = None
+# backend/tailoresume-firebase-adminsdk-fbsvc-3d6b16b04c.json, relative to app/core
+DEFAULT_SERVICE_KEY_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "..", "tailoresume-firebase-adminsdk-fbsvc-3d6b16b04c.json"
+)
 
-    if cred_path_env:
-        try:
-            print(f"Attempting to initialize Firebase Admin SDK using GOOGLE_APPLICATION_CREDENTIALS: {cred_path_env}")
-            cred = credentials.Certificate(cred_path_env)
-            initialized_by = "GOOGLE_APPLICATION_CREDENTIALS"
-        except Exception as e:
-            print(f"Error initializing Firebase Admin SDK from GOOGLE_APPLICATION_CREDENTIALS ({cred_path_env}): {e}")
-            print("Falling back to default path.")
-    
-    if not cred: # If env var failed or not set, try default path
-        try:
-            print(f"Attempting to initialize Firebase Admin SDK using default path: {service_key_path}")
-            if os.path.exists(service_key_path):
-                cred = credentials.Certificate(service_key_path)
-                initialized_by = f"default path ({service_key_path})"
-            else:
-                print(f"Warning: Service account key not found at default path: {service_key_path}.")
-        except Exception as e:
-            print(f"Error initializing Firebase Admin SDK from default path ({service_key_path}): {e}")
+# Verified Firebase tokens, keyed by SHA-256 of the raw ID token and whether
+# revocation was checked. A signature-only result cannot change before the
+# token expires, so it is kept longer than one that also asked Firebase whether
+# the token was revoked. Entries never outlive the token's own exp claim.
+# The Google signing keys themselves are cached by firebase_admin, which
+# honours the max-age of the certificate response.
+FIREBASE_TOKEN_CACHE_TTL_SECONDS = 60
+FIREBASE_REVOCATION_CACHE_TTL_SECONDS = 5
 
-    if cred:
-        try:
-            firebase_admin.initialize_app(cred)
-            print(f"Firebase Admin SDK initialized successfully using {initialized_by}.")
-        except Exception as e:
-            print(f"Critical error during firebase_admin.initialize_app(): {e}")
-    else:
-        print("CRITICAL: Firebase Admin SDK could not be initialized. Credentials not loaded.")
+def _firebase_token_ttu(key, firebase_user, now):
+    _, check_revoked = key
+    ttl = FIREBASE_REVOCATION_CACHE_TTL_SECONDS if check_revoked else FIREBASE_TOKEN_CACHE_TTL_SECONDS
+    return min(now + ttl, firebase_user["token"]["exp"])
+
+_firebase_token_cache = TLRUCache(maxsize=10000, ttu=_firebase_token_ttu, timer=time.time)
+_firebase_token_cache_lock = threading.Lock()
+
+def init_firebase():
+    """
+    Initializes the Firebase Admin SDK, once per process.
+    The service account key is read from GOOGLE_APPLICATION_CREDENTIALS, or in
+    development from its downloaded name in the backend directory.
+    """
+    if firebase_admin._apps: # Check if already initialized
+        logger.info("Firebase Admin SDK already initialized.")
+        return
+
+    service_key_path = os.getenv('GOOGLE_APPLICATION_CREDENTIALS') or DEFAULT_SERVICE_KEY_PATH
+    try:
+        cred = credentials.Certificate(service_key_path)
+        firebase_admin.initialize_app(cred)
+    except Exception as e:
+        logger.critical("Firebase Admin SDK could not be initialized from %s: %s", service_key_path, e)
+        return
+    logger.info("Firebase Admin SDK initialized from %s.", service_key_path)
 
 
 oauth2_scheme_firebase = HTTPBearer()
@@ -62,23 +61,45 @@ async def verify_firebase_token(token: HTTPAuthorizationCredentials = Depends(oa
     """
     Verify Firebase ID token.
     This function can be used as a dependency in FastAPI path operations
-    to protect routes that require Firebase authentication.
+    to protect routes that require Firebase authentication. Only the token
+    signature and claims are checked, which needs no call to Firebase.
     """
+    return await _verify_firebase_token(token, check_revoked=False)
+
+async def verify_firebase_token_strict(token: HTTPAuthorizationCredentials = Depends(oauth2_scheme_firebase)):
+    """
+    Verify Firebase ID token and that it has not been revoked.
+    Revocation is looked up on Firebase, so use this only on privileged
+    routes, such as exchanging the token for a backend session.
+    """
+    return await _verify_firebase_token(token, check_revoked=True)
+
+async def _verify_firebase_token(token: HTTPAuthorizationCredentials, check_revoked: bool):
     if not token:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not authenticated"
         )
+    cache_key = (hashlib.sha256(token.credentials.encode()).digest(), check_revoked)
+    with _firebase_token_cache_lock:
+        cached = _firebase_token_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     try:
-        # Verify the ID token while checking if the token is revoked by
-        # passing check_revoked=True.
-        decoded_token = auth.verify_id_token(token.credentials, check_revoked=True)
-        # The token is valid and not revoked.
+        # check_revoked=True also asks Firebase whether the token was revoked.
+        # Verification blocks (key fetch, revocation lookup), so it runs in a
+        # worker thread to keep the event loop serving other requests.
+        decoded_token = await asyncio.to_thread(auth.verify_id_token, token.credentials, check_revoked=check_revoked)
+        # The token is valid (and not revoked, if that was checked).
         uid = decoded_token['uid']
         email = decoded_token.get('email')
         name = decoded_token.get('name')
         # You can return the decoded token or specific user info
-        return {"uid": uid, "email": email, "name": name, "token": decoded_token}
+        firebase_user = {"uid": uid, "email": email, "name": name, "token": decoded_token}
+        with _firebase_token_cache_lock:
+            _firebase_token_cache[cache_key] = firebase_user
+        return firebase_user
     except auth.RevokedIdTokenError:
         # Token has been revoked. Inform the user to reauthenticate.
         raise HTTPException(
@@ -102,7 +123,7 @@ async def verify_firebase_token(token: HTTPAuthorizationCredentials = Depends(oa
         )
     except Exception as e:
         # Other Firebase Admin SDK errors
-        print(f"An unexpected error occurred during Firebase token verification: {e}")
+        logger.error("An unexpected error occurred during Firebase token verification: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Could not verify Firebase token.",
@@ -1,28 +1,111 @@
-from fastapi import FastAPI
+import hashlib
+import os
+from contextlib import asynccontextmanager
+
+from anyio import to_thread
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 
 # Use absolute imports instead of relative imports
 from app.api import auth, users, skills, work_experiences, educations, resumes, api_keys, job_analysis, projects, certifications, languages
+from app.core.database import DB_MAX_OVERFLOW, DB_POOL_SIZE, engine
 from app.core.firebase_auth import init_firebase # Import init_firebase
+from app.services.ai_service import AIProviderBusyError, AIProviderError, close_async_http_client
+
+# Sync endpoints run on AnyIO's worker threads (40 by default). Most of them
+# wait on the database, so allow as many to run at once as the pool has
+# connections (pool_size + max_overflow). Threads beyond that would only
+# block on pool checkout. Raising one means raising the other.
+WORKER_THREADS = int(os.getenv("WORKER_THREADS", str(DB_POOL_SIZE + DB_MAX_OVERFLOW)))
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    init_firebase()
+    to_thread.current_default_thread_limiter().total_tokens = WORKER_THREADS
+    yield
+    # The AI providers' pooled HTTP client is shared by every request
+    await close_async_http_client()
+    # Close the pooled database connections instead of dropping them on exit
+    engine.dispose()
 
 app = FastAPI(
     title="tailoresume API",
     description="API for managing skills and generating tailored resumes",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
-# Call init_firebase on startup
-@app.on_event("startup")
-async def startup_event():
-    init_firebase()
+@app.exception_handler(AIProviderBusyError)
+async def ai_provider_busy_handler(request: Request, exc: AIProviderBusyError):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
+@app.exception_handler(AIProviderError)
+async def ai_provider_error_handler(request: Request, exc: AIProviderError):
+    # The provider, not this API, failed the request
+    return JSONResponse(status_code=502, content={"detail": str(exc)})
+
+# Methods whose responses reflect a change and must not be stored
+UNCACHEABLE_METHODS = ("POST", "PUT", "PATCH", "DELETE")
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    Whether an If-None-Match header lists etag. The comparison is weak, as
+    RFC 9110 requires for If-None-Match: a W/ prefix on either side is ignored.
+    """
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag.removeprefix("W/"):
+            return True
+    return False
+
+@app.middleware("http")
+async def http_cache_middleware(request: Request, call_next):
+    # Clients re-fetch unchanged lists often; an ETag over the JSON body lets
+    # them revalidate and skip the download. Streams are passed through as-is.
+    # The data is per user and changes with the client's own writes, so the
+    # browser may keep a copy but must revalidate it on every use.
+    response = await call_next(request)
+    if request.method in UNCACHEABLE_METHODS:
+        response.headers["Cache-Control"] = "no-store"
+        return response
+    if (request.method != "GET"
+            or response.status_code != 200
+            or not response.headers.get("content-type", "").startswith("application/json")):
+        return response
+
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    if _etag_matches(request.headers.get("if-none-match", ""), etag):
+        not_modified = Response(status_code=304)
+        not_modified.raw_headers = [
+            (name, value) for name, value in response.raw_headers
+            if name not in (b"content-length", b"content-type")
+        ]
+        not_modified.headers["ETag"] = etag
+        not_modified.headers["Cache-Control"] = "private, no-cache"
+        return not_modified
+
+    cached = Response(content=body, status_code=200)
+    cached.raw_headers = [(name, value) for name, value in response.raw_headers if name != b"content-length"]
+    cached.headers["Content-Length"] = str(len(body))
+    cached.headers["ETag"] = etag
+    cached.headers["Cache-Control"] = "private, no-cache"
+    return cached
 
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3000"],  # React frontend URL
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PUT", "DELETE"],
+    allow_headers=["Authorization", "Content-Type", "If-None-Match"],
+    expose_headers=["X-Next-Cursor", "Retry-After", "ETag"],
+    max_age=86400,  # Let browsers reuse a preflight for a day
 )
 
 # Include routers
@@ -1,8 +1,9 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Table, Enum, Text, Date, Boolean
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, ForeignKey, Table, Enum, Text, Date, DateTime, Boolean, UniqueConstraint, Index, func
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 from enum import Enum as PyEnum
 
 from ..core.database import Base
+from ..core.encryption import EncryptedString
 
 # Enum for experience levels
 class ExperienceLevel(str, PyEnum):
@@ -11,12 +12,17 @@ class ExperienceLevel(str, PyEnum):
     ADVANCED = "Advanced"
     EXPERT = "Expert"
 
+# Association tables are indexed for both directions: loading a resume's items
+# (resume_id, item id) and clearing an item's rows when it is deleted (item id)
+
 # Association table for many-to-many relationship between skills and resumes
 skill_resume_association = Table(
     'skill_resume',
     Base.metadata,
     Column('skill_id', Integer, ForeignKey('skills.id')),
-    Column('resume_id', Integer, ForeignKey('resumes.id'))
+    Column('resume_id', Integer, ForeignKey('resumes.id')),
+    Index('ix_skill_resume_resume_id', 'resume_id', 'skill_id'),
+    Index('ix_skill_resume_skill_id', 'skill_id')
 )
 
 # Association table for work experiences and resumes
@@ -24,7 +30,9 @@ work_experience_resume_association = Table(
     'work_experience_resume',
     Base.metadata,
     Column('work_experience_id', Integer, ForeignKey('work_experiences.id')),
-    Column('resume_id', Integer, ForeignKey('resumes.id'))
+    Column('resume_id', Integer, ForeignKey('resumes.id')),
+    Index('ix_work_experience_resume_resume_id', 'resume_id', 'work_experience_id'),
+    Index('ix_work_experience_resume_work_experience_id', 'work_experience_id')
 )
 
 # Association table for educations and resumes
@@ -32,7 +40,9 @@ education_resume_association = Table(
     'education_resume',
     Base.metadata,
     Column('education_id', Integer, ForeignKey('educations.id')),
-    Column('resume_id', Integer, ForeignKey('resumes.id'))
+    Column('resume_id', Integer, ForeignKey('resumes.id')),
+    Index('ix_education_resume_resume_id', 'resume_id', 'education_id'),
+    Index('ix_education_resume_education_id', 'education_id')
 )
 
 # Association table for projects and resumes
@@ -40,7 +50,9 @@ project_resume_association = Table(
     'project_resume',
     Base.metadata,
     Column('project_id', Integer, ForeignKey('projects.id')),
-    Column('resume_id', Integer, ForeignKey('resumes.id'))
+    Column('resume_id', Integer, ForeignKey('resumes.id')),
+    Index('ix_project_resume_resume_id', 'resume_id', 'project_id'),
+    Index('ix_project_resume_project_id', 'project_id')
 )
 
 # Association table for certifications and resumes
@@ -48,7 +60,9 @@ certification_resume_association = Table(
     'certification_resume',
     Base.metadata,
     Column('certification_id', Integer, ForeignKey('certifications.id')),
-    Column('resume_id', Integer, ForeignKey('resumes.id'))
+    Column('resume_id', Integer, ForeignKey('resumes.id')),
+    Index('ix_certification_resume_resume_id', 'resume_id', 'certification_id'),
+    Index('ix_certification_resume_certification_id', 'certification_id')
 )
 
 # Association table for languages and resumes
@@ -56,13 +70,15 @@ language_resume_association = Table(
     'language_resume',
     Base.metadata,
     Column('language_id', Integer, ForeignKey('languages.id')),
-    Column('resume_id', Integer, ForeignKey('resumes.id'))
+    Column('resume_id', Integer, ForeignKey('resumes.id')),
+    Index('ix_language_resume_resume_id', 'resume_id', 'language_id'),
+    Index('ix_language_resume_language_id', 'language_id')
 )
 
 class User(Base):
     __tablename__ = "users"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     email = Column(String, unique=True, index=True)
     username = Column(String, unique=True, index=True)
     hashed_password = Column(String)
@@ -84,10 +100,10 @@ class User(Base):
     # Profile information
     summary = Column(Text, nullable=True)
     
-    # API key management (BYOK model)
-    api_key_openai = Column(String, nullable=True)
-    api_key_anthropic = Column(String, nullable=True)
-    api_key_google = Column(String, nullable=True)
+    # API key management (BYOK model), encrypted at rest
+    api_key_openai = Column(EncryptedString, nullable=True)
+    api_key_anthropic = Column(EncryptedString, nullable=True)
+    api_key_google = Column(EncryptedString, nullable=True)
     preferred_ai_provider = Column(String, nullable=True, default="openai")  # 'openai', 'anthropic', 'google'
     
     # Relationships
@@ -99,8 +115,14 @@ class User(Base):
     certifications = relationship("Certification", back_populates="user")
     languages = relationship("Language", back_populates="user")
 
+# Serves the case-insensitive email lookups done at login and on email checks
+Index("ix_users_email_lower", func.lower(User.email))
+
 class Skill(Base):
     __tablename__ = "skills"
+    __table_args__ = (
+        UniqueConstraint("user_id", "name", name="uq_skill_user_name"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, index=True)
@@ -115,6 +137,9 @@ class Skill(Base):
     user = relationship("User", back_populates="skills")
     resumes = relationship("Resume", secondary=skill_resume_association, back_populates="skills")
 
+# Serves get_skills: filter by user and optionally category, ordered by id
+Index("ix_skill_user_category", Skill.user_id, Skill.category, Skill.id)
+
 class WorkExperience(Base):
     __tablename__ = "work_experiences"
     
@@ -142,6 +167,9 @@ class WorkExperience(Base):
     user = relationship("User", back_populates="work_experiences")
     resumes = relationship("Resume", secondary=work_experience_resume_association, back_populates="work_experiences")
 
+# Serves get_work_experiences: filter by user, newest start_date first
+Index("ix_work_experience_user_startdate", WorkExperience.user_id, WorkExperience.start_date.desc())
+
 class Education(Base):
     __tablename__ = "educations"
     
@@ -170,8 +198,14 @@ class Education(Base):
     user = relationship("User", back_populates="educations")
     resumes = relationship("Resume", secondary=education_resume_association, back_populates="educations")
 
+# Serves get_educations: filter by user, newest start_date first
+Index("ix_education_user_startdate", Education.user_id, Education.start_date.desc(), Education.id.desc())
+
 class Project(Base):
     __tablename__ = "projects"
+    __table_args__ = (
+        UniqueConstraint("user_id", "name", name="uq_project_user_name"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -191,8 +225,14 @@ class Project(Base):
     user = relationship("User", back_populates="projects")
     resumes = relationship("Resume", secondary=project_resume_association, back_populates="projects")
 
+# Serves get_projects: filter by user, keyset on id
+Index("ix_project_user_id", Project.user_id, Project.id)
+
 class Certification(Base):
     __tablename__ = "certifications"
+    __table_args__ = (
+        UniqueConstraint("user_id", "name", name="uq_cert_user_name"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -211,6 +251,9 @@ class Certification(Base):
 
 class Language(Base):
     __tablename__ = "languages"
+    __table_args__ = (
+        UniqueConstraint("user_id", "name", name="uq_language_user_name"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -223,6 +266,9 @@ class Language(Base):
     user = relationship("User", back_populates="languages")
     resumes = relationship("Resume", secondary=language_resume_association, back_populates="languages")
 
+# Serves get_languages: filter by user, keyset on id
+Index("ix_language_user_id", Language.user_id, Language.id)
+
 class Resume(Base):
     __tablename__ = "resumes"
     
@@ -231,8 +277,8 @@ class Resume(Base):
     
     # Resume metadata
     title = Column(String, index=True)
-    created_at = Column(String)  # Will store ISO format datetime
-    last_modified = Column(String)  # Will store ISO format datetime
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    last_modified = Column(DateTime(timezone=True), server_default=func.now())  # Set by the app when it changes a resume
     
     # Job targeting
     job_description = Column(Text, nullable=True)
@@ -242,6 +288,7 @@ class Resume(Base):
     # Output format and content
     format = Column(String)  # e.g., PDF, Word, LaTeX
     content = Column(Text)  # Could be JSON or formatted template data
+    input_hash = Column(String(32), nullable=True)  # Digest of the generation inputs, see ResumeGenerator
     
     # ATS compatibility score and metadata
     ats_score = Column(Integer, nullable=True)
@@ -266,4 +313,10 @@ class Resume(Base):
     educations = relationship("Education", secondary=education_resume_association, back_populates="resumes")
     projects = relationship("Project", secondary=project_resume_association, back_populates="resumes")
     certifications = relationship("Certification", secondary=certification_resume_association, back_populates="resumes")
-    languages = relationship("Language", secondary=language_resume_association, back_populates="resumes")
\ No newline at end of file
+    languages = relationship("Language", secondary=language_resume_association, back_populates="resumes")
+
+# Serves get_resumes: filter by user, newest first
+Index("ix_resume_user_created", Resume.user_id, Resume.created_at.desc())
+
+# Serves the lookup of an already generated resume for identical inputs
+Index("ix_resume_user_input_hash", Resume.user_id, Resume.input_hash)
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional
 
 class LanguageBase(BaseModel):
@@ -16,8 +16,7 @@ class LanguageInDBBase(LanguageBase):
     id: int
     user_id: int
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class Language(LanguageInDBBase):
     pass
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional
 from app.models.models import ExperienceLevel # Import the Enum
 
@@ -25,8 +25,7 @@ class SkillInDBBase(SkillBase):
     id: int
     user_id: int
 
-    class Config:
-        orm_mode = True # Changed from from_attributes = True for Pydantic v1 compatibility if that's what the project uses
+    model_config = ConfigDict(from_attributes=True)
 
 # For returning a skill from the API
 class Skill(SkillInDBBase):
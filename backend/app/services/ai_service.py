@@ -1,10 +1,98 @@
-import json
+import asyncio
+import math
 import os
-from typing import Dict, List, Optional, Tuple, Any
-import requests
-from pydantic import BaseModel
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+import httpx
+from openai import AsyncOpenAI, OpenAIError, RateLimitError
+from pydantic import BaseModel, Field
+from pydantic_core import from_json, to_json
 from sqlalchemy.orm import Session
 
+# LLM calls routinely take tens of seconds, well past httpx's 5s default
+AI_REQUEST_TIMEOUT_SECONDS = 60.0
+
+# Shared by every AIService, both for providers called over plain HTTP and as
+# the transport of the OpenAI SDK clients. The API key is sent per request,
+# so one pooled client serves all users. HTTP/2 lets
+# concurrent calls to a provider share one connection.
+_async_http_client: Optional[httpx.AsyncClient] = None
+
+def _get_async_http_client() -> httpx.AsyncClient:
+    global _async_http_client
+    if _async_http_client is None:
+        _async_http_client = httpx.AsyncClient(
+            timeout=AI_REQUEST_TIMEOUT_SECONDS,
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=100)
+        )
+    return _async_http_client
+
+async def close_async_http_client() -> None:
+    """Close the shared HTTP client; called on application shutdown."""
+    global _async_http_client
+    if _async_http_client is not None:
+        await _async_http_client.aclose()
+        _async_http_client = None
+
+# Client-side admission control for async LLM calls. Each provider gets a cap on
+# concurrent calls from this process, and each API key a token bucket for its
+# request rate, so a traffic burst queues briefly or fails fast with
+# AIProviderBusyError instead of fanning out into provider 429s.
+AI_MAX_CONCURRENT_CALLS = int(os.getenv("AI_MAX_CONCURRENT_CALLS", "20"))
+AI_REQUESTS_PER_MINUTE = int(os.getenv("AI_REQUESTS_PER_MINUTE", "60"))
+AI_ADMISSION_TIMEOUT_SECONDS = float(os.getenv("AI_ADMISSION_TIMEOUT_SECONDS", "10"))
+# Retries when a provider still answers 429, fails transiently or drops the
+# connection, with exponential backoff
+AI_MAX_RETRIES = 5
+AI_MAX_BACKOFF_SECONDS = 30
+AI_TRANSIENT_STATUS_CODES = {500, 502, 503, 504}
+
+_provider_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+def _get_provider_semaphore(provider: str) -> asyncio.Semaphore:
+    semaphore = _provider_semaphores.get(provider)
+    if semaphore is None:
+        semaphore = _provider_semaphores[provider] = asyncio.Semaphore(AI_MAX_CONCURRENT_CALLS)
+    return semaphore
+
+class AIProviderBusyError(Exception):
+    """Raised when an AI call cannot be admitted in time; callers should retry after retry_after seconds."""
+
+    def __init__(self, provider: str, retry_after: int):
+        super().__init__(f"Too many concurrent requests to {provider}, please retry shortly")
+        self.provider = provider
+        self.retry_after = retry_after
+
+class AIProviderError(Exception):
+    """Raised when an AI provider call fails or returns a response that cannot be used."""
+
+    def __init__(self, provider: str, message: str):
+        super().__init__(f"{provider} request failed: {message}")
+        self.provider = provider
+
+class _TokenBucket:
+    """Token bucket refilled at rate_per_minute. Used from the event loop only, so it needs no lock."""
+
+    def __init__(self, rate_per_minute: int):
+        self.capacity = rate_per_minute
+        self.tokens = float(rate_per_minute)
+        self.fill_rate = rate_per_minute / 60.0
+        self.updated = time.monotonic()
+
+    def reserve(self) -> float:
+        """Take a token, returning how many seconds to wait before it may be used."""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.fill_rate)
+        self.updated = now
+        self.tokens -= 1
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.fill_rate
+
+    def cancel(self) -> None:
+        """Return a token taken by reserve() that will not be used."""
+        self.tokens += 1
+
 class AIProvider:
     OPENAI = "openai"
     ANTHROPIC = "anthropic"
@@ -16,6 +104,8 @@ class DatabankCoverage(BaseModel):
     critical_gaps: List[str]
     transferable_skills: List[Dict[str, str]]
     databank_utilization_percentage: float
+    # Set on the safe default returned when the AI response could not be used
+    analysis_failed: bool = Field(default=False, exclude=True)
 
 class GapRecommendation(BaseModel):
     """Recommendation for filling databank gaps"""
@@ -34,8 +124,64 @@ class AIService:
     def __init__(self, api_key: str = None, provider: str = AIProvider.OPENAI):
         self.api_key = api_key
         self.provider = provider
+        # The OpenAI client carries the API key, so it is per instance; it is
+        # created on first use and kept so repeat calls reuse its connections
+        self._async_openai_client = None
+        self._rate_limiter = _TokenBucket(AI_REQUESTS_PER_MINUTE)
+        # Headers for the providers called over plain HTTP, fixed per key
+        self._anthropic_headers = {
+            "Content-Type": "application/json",
+            "X-API-Key": api_key
+        }
+        self._google_headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {api_key}"
+        }
+        self._provider_calls = {
+            AIProvider.OPENAI: self._call_openai_async,
+            AIProvider.ANTHROPIC: self._call_anthropic_async,
+            AIProvider.GOOGLE: self._call_google_async,
+        }
+        # Providers whose API can stream a completion as it is generated
+        self._provider_streams = {
+            AIProvider.OPENAI: self._stream_openai,
+            AIProvider.ANTHROPIC: self._stream_anthropic,
+        }
+    
+    @asynccontextmanager
+    async def _admission(self):
+        """Admit one outbound AI call: the key's rate limit first, then the provider's concurrency cap."""
+        delay = self._rate_limiter.reserve()
+        if delay > AI_ADMISSION_TIMEOUT_SECONDS:
+            self._rate_limiter.cancel()
+            raise AIProviderBusyError(self.provider, retry_after=math.ceil(delay))
+        if delay:
+            await asyncio.sleep(delay)
+
+        semaphore = _get_provider_semaphore(self.provider)
+        try:
+            await asyncio.wait_for(semaphore.acquire(), timeout=AI_ADMISSION_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            raise AIProviderBusyError(self.provider, retry_after=math.ceil(AI_ADMISSION_TIMEOUT_SECONDS))
+        try:
+            yield
+        finally:
+            semaphore.release()
+    
+    def _get_async_openai_client(self):
+        if self._async_openai_client is None:
+            # The SDK retries 429s itself with exponential backoff. Cached
+            # services are evicted without being closed, so the SDK gets the
+            # shared HTTP client rather than opening a pool of its own.
+            self._async_openai_client = AsyncOpenAI(
+                api_key=self.api_key,
+                timeout=AI_REQUEST_TIMEOUT_SECONDS,
+                max_retries=AI_MAX_RETRIES,
+                http_client=_get_async_http_client()
+            )
+        return self._async_openai_client
     
-    def analyze_job_description(self, job_description: str) -> Dict[str, Any]:
+    async def analyze_job_description_async(self, job_description: str) -> Dict[str, Any]:
         """
         Analyzes a job description to extract key skills, requirements, and other relevant information.
         
@@ -48,6 +194,32 @@ class AIService:
         if not self.api_key:
             raise ValueError("API key is required for job description analysis")
         
+        prompt = self._build_job_description_prompt(job_description)
+        return await self._call_ai_provider_async(prompt)
+    
+    async def match_skills_to_job_async(
+        self, 
+        job_analysis: Dict[str, Any], 
+        user_skills: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Match a user's skills to a job's requirements and identify gaps.
+        
+        Args:
+            job_analysis: The analyzed job description data
+            user_skills: List of the user's skills with metadata
+            
+        Returns:
+            A dictionary with matching skills, missing skills, and relevance scores
+        """
+        if not self.api_key:
+            raise ValueError("API key is required for skill matching")
+        
+        prompt = self._build_skill_match_prompt(job_analysis, user_skills)
+        return await self._call_ai_provider_async(prompt)
+    
+    def _build_job_description_prompt(self, job_description: str) -> str:
+        """Build the prompt used to analyze a job description."""
         # Prepare prompt for the AI
         prompt = f"""
         Analyze the following job description and extract key information.
@@ -70,41 +242,20 @@ class AIService:
         
         Provide only the JSON response without any additional text or explanations.
         """
-        
-        # Call the appropriate AI provider
-        if self.provider == AIProvider.OPENAI:
-            return self._call_openai(prompt)
-        elif self.provider == AIProvider.ANTHROPIC:
-            return self._call_anthropic(prompt)
-        elif self.provider == AIProvider.GOOGLE:
-            return self._call_google(prompt)
-        else:
-            raise ValueError(f"Unsupported AI provider: {self.provider}")
+        return prompt
     
-    def match_skills_to_job(
-        self, 
-        job_analysis: Dict[str, Any], 
+    def _build_skill_match_prompt(
+        self,
+        job_analysis: Dict[str, Any],
         user_skills: List[Dict[str, Any]]
-    ) -> Dict[str, Any]:
-        """
-        Match a user's skills to a job's requirements and identify gaps.
-        
-        Args:
-            job_analysis: The analyzed job description data
-            user_skills: List of the user's skills with metadata
-            
-        Returns:
-            A dictionary with matching skills, missing skills, and relevance scores
-        """
-        if not self.api_key:
-            raise ValueError("API key is required for skill matching")
-        
+    ) -> str:
+        """Build the prompt used to match a user's skills to an analyzed job."""
         # Format the user's skills for the prompt
         user_skills_text = "\n".join([
-            f"- {skill['name']} (Category: {skill['category']}, " +
-            f"Level: {skill['experience_level']}, " +
-            f"Years: {skill['years_of_experience'] or 'Not specified'})" +
-            (f", Details: {skill['details']}" if skill.get('details') else "")
+            f"- {skill['name']} (Category: {skill['category']}, "
+            f"Level: {skill['experience_level']}, "
+            f"Years: {skill['years_of_experience'] or 'Not specified'})"
+            f"{', Details: ' + skill['details'] if skill.get('details') else ''}"
             for skill in user_skills
         ])
         
@@ -140,18 +291,9 @@ class AIService:
         
         Provide only the JSON response without any additional text or explanations.
         """
-        
-        # Call the appropriate AI provider
-        if self.provider == AIProvider.OPENAI:
-            return self._call_openai(prompt)
-        elif self.provider == AIProvider.ANTHROPIC:
-            return self._call_anthropic(prompt)
-        elif self.provider == AIProvider.GOOGLE:
-            return self._call_google(prompt)
-        else:
-            raise ValueError(f"Unsupported AI provider: {self.provider}")
+        return prompt
     
-    def generate_resume_content(
+    async def generate_resume_content_async(
         self,
         user_data: Dict[str, Any],
         job_analysis: Dict[str, Any],
@@ -175,21 +317,13 @@ class AIService:
         # This would be a long, detailed prompt in a real implementation
         prompt = "Generate resume content based on user data and job analysis..."
         
-        # Call the appropriate AI provider
-        if self.provider == AIProvider.OPENAI:
-            result = self._call_openai(prompt)
-        elif self.provider == AIProvider.ANTHROPIC:
-            result = self._call_anthropic(prompt)
-        elif self.provider == AIProvider.GOOGLE:
-            result = self._call_google(prompt)
-        else:
-            raise ValueError(f"Unsupported AI provider: {self.provider}")
+        result = await self._call_ai_provider_async(prompt)
         
         # Process and return the result
         # In a real implementation, this would format the content appropriately
         return result.get("resume_content", "")
 
-    def validate_databank_coverage(
+    async def validate_databank_coverage_async(
         self, 
         job_analysis: Dict[str, Any], 
         user_databank: Dict[str, Any]
@@ -208,11 +342,26 @@ class AIService:
         if not self.api_key:
             raise ValueError("API key is required for databank validation")
         
+        prompt = self._build_databank_coverage_prompt(job_analysis, user_databank)
+        result = await self._call_ai_provider_async(prompt)
+        return self._parse_databank_coverage(result, job_analysis, user_databank)
+
+    def summarize_databank(self, user_databank: Dict[str, Any]) -> Tuple[List[str], int, List[str], List[str]]:
+        """Return the user's skill names, total experience years, degrees and certification names."""
         # Extract user databank summary
         user_skills = [skill['name'] for skill in user_databank.get('skills', [])]
         user_experience_years = sum([exp.get('years', 0) for exp in user_databank.get('work_experiences', [])])
         user_education = [edu.get('degree', '') for edu in user_databank.get('educations', [])]
         user_certifications = [cert['name'] for cert in user_databank.get('certifications', [])]
+        return user_skills, user_experience_years, user_education, user_certifications
+
+    def _build_databank_coverage_prompt(
+        self,
+        job_analysis: Dict[str, Any],
+        user_databank: Dict[str, Any]
+    ) -> str:
+        """Build the databank coverage validation prompt."""
+        user_skills, user_experience_years, user_education, user_certifications = self.summarize_databank(user_databank)
         
         # Prepare anti-hallucination validation prompt
         prompt = f"""
@@ -265,13 +414,20 @@ class AIService:
         
         ONLY analyze what EXISTS in the databank. Do NOT suggest fabricated content.
         """
-        
-        # Call AI provider
-        result = self._call_ai_provider(prompt)
+        return prompt
+
+    def _parse_databank_coverage(
+        self,
+        result: Any,
+        job_analysis: Dict[str, Any],
+        user_databank: Dict[str, Any]
+    ) -> DatabankCoverage:
+        """Parse a coverage response, falling back to a safe default if it is malformed."""
+        _, user_experience_years, user_education, _ = self.summarize_databank(user_databank)
         
         # Parse and validate response
         try:
-            coverage_data = result if isinstance(result, dict) else json.loads(result)
+            coverage_data = result if isinstance(result, dict) else from_json(result)
             return DatabankCoverage(**coverage_data)
         except Exception as e:
             # Return safe default if parsing fails
@@ -284,10 +440,11 @@ class AIService:
                 },
                 critical_gaps=[],
                 transferable_skills=[],
-                databank_utilization_percentage=0.0
+                databank_utilization_percentage=0.0,
+                analysis_failed=True
             )
 
-    def identify_databank_gaps(
+    async def identify_databank_gaps_async(
         self, 
         coverage_analysis: DatabankCoverage, 
         job_analysis: Dict[str, Any]
@@ -296,7 +453,7 @@ class AIService:
         Generate specific, actionable recommendations for databank improvement.
         
         Args:
-            coverage_analysis: Results from validate_databank_coverage
+            coverage_analysis: Results from validate_databank_coverage_async
             job_analysis: Original job analysis data
             
         Returns:
@@ -305,14 +462,20 @@ class AIService:
         if not self.api_key:
             raise ValueError("API key is required for gap identification")
         
+        prompt = self._build_gap_prompt(coverage_analysis, job_analysis)
+        result = await self._call_ai_provider_async(prompt)
+        return self._parse_gap_recommendations(result)
+
+    def _build_gap_prompt(self, coverage_analysis: DatabankCoverage, job_analysis: Dict[str, Any]) -> str:
+        """Build the databank enhancement recommendations prompt."""
         prompt = f"""
         Based on the databank coverage analysis, generate specific recommendations for databank enhancement.
         
         Coverage Analysis:
-        {coverage_analysis.dict()}
+        {coverage_analysis.model_dump_json(indent=2)}
         
         Job Analysis:
-        {job_analysis}
+        {to_json(job_analysis, indent=2).decode()}
         
         Generate actionable recommendations in JSON format:
         {{
@@ -330,11 +493,11 @@ class AIService:
         Focus on SPECIFIC, ACTIONABLE items the user can add to their databank.
         Do NOT suggest fabricating experience - only suggest documenting existing skills/experience.
         """
-        
-        result = self._call_ai_provider(prompt)
-        
+        return prompt
+
+    def _parse_gap_recommendations(self, result: Any) -> List[GapRecommendation]:
         try:
-            gap_data = result if isinstance(result, dict) else json.loads(result)
+            gap_data = result if isinstance(result, dict) else from_json(result)
             recommendations = []
             for rec in gap_data.get('recommendations', []):
                 recommendations.append(GapRecommendation(**rec))
@@ -342,7 +505,7 @@ class AIService:
         except Exception as e:
             return []
 
-    def suggest_transferable_skills(
+    async def suggest_transferable_skills_async(
         self, 
         user_databank: Dict[str, Any], 
         job_requirements: List[str]
@@ -368,10 +531,10 @@ class AIService:
         Analyze the user's existing databank to identify transferable skills that match job requirements.
         
         User's Work Experience:
-        {json.dumps(work_experiences, indent=2)}
+        {to_json(work_experiences, indent=2).decode()}
         
         User's Documented Skills:
-        {json.dumps(user_skills, indent=2)}
+        {to_json(user_skills, indent=2).decode()}
         
         Job Requirements:
         {job_requirements}
@@ -391,15 +554,15 @@ class AIService:
         ONLY identify transfers from EXISTING databank content. Do NOT suggest skills the user doesn't have.
         """
         
-        result = self._call_ai_provider(prompt)
+        result = await self._call_ai_provider_async(prompt)
         
         try:
-            transfer_data = result if isinstance(result, dict) else json.loads(result)
+            transfer_data = result if isinstance(result, dict) else from_json(result)
             return transfer_data.get('transferable_skills', [])
         except Exception as e:
             return []
 
-    def generate_anti_hallucination_resume(
+    async def generate_anti_hallucination_resume_async(
         self,
         user_databank: Dict[str, Any],
         job_analysis: Dict[str, Any],
@@ -408,7 +571,7 @@ class AIService:
     ) -> Dict[str, Any]:
         """
         Generate resume content using ONLY verified databank information.
-        Enhanced version of generate_resume_content with anti-hallucination enforcement.
+        Enhanced version of generate_resume_content_async with anti-hallucination enforcement.
         
         Args:
             user_databank: Complete user databank
@@ -422,6 +585,103 @@ class AIService:
         if not self.api_key:
             raise ValueError("API key is required for resume generation")
         
+        system_prompt, user_prompt = self._build_anti_hallucination_resume_prompts(
+            user_databank, job_analysis, coverage_analysis
+        )
+        result = await self._call_ai_provider_with_system_async(system_prompt, user_prompt)
+        return self.parse_anti_hallucination_resume(result)
+
+    async def stream_anti_hallucination_resume(
+        self,
+        user_databank: Dict[str, Any],
+        job_analysis: Dict[str, Any],
+        coverage_analysis: DatabankCoverage,
+        max_databank_utilization: bool = True
+    ) -> AsyncIterator[str]:
+        """
+        Stream the raw text of an anti-hallucination resume as the provider produces it.
+        Takes the same arguments as generate_anti_hallucination_resume_async, and
+        the concatenated chunks form the same JSON document it parses.
+        """
+        if not self.api_key:
+            raise ValueError("API key is required for resume generation")
+        
+        system_prompt, user_prompt = self._build_anti_hallucination_resume_prompts(
+            user_databank, job_analysis, coverage_analysis
+        )
+        
+        stream_provider = self._provider_streams.get(self.provider)
+        if stream_provider is not None:
+            async with self._admission():
+                async for chunk in stream_provider(system_prompt, user_prompt):
+                    yield chunk
+        else:
+            # Google's text API has no streaming mode; send the whole response at once
+            result = await self._call_ai_provider_with_system_async(system_prompt, user_prompt)
+            yield to_json(result).decode()
+
+    async def _stream_openai(self, system_prompt: str, user_prompt: str) -> AsyncIterator[str]:
+        try:
+            stream = await self._get_async_openai_client().chat.completions.create(
+                model="gpt-4",  # Or another appropriate model
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt}
+                ],
+                temperature=0.1,  # Very low temperature for factual, non-creative responses
+                stream=True
+            )
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        except RateLimitError as e:
+            raise AIProviderBusyError(self.provider, retry_after=AI_MAX_BACKOFF_SECONDS) from e
+        except OpenAIError as e:
+            raise AIProviderError(self.provider, str(e)) from e
+
+    async def _stream_anthropic(self, system_prompt: str, user_prompt: str) -> AsyncIterator[str]:
+        # Sent like _call_ai_provider_with_system_async does, as one prompt
+        data = {
+            "prompt": f"\n\nHuman: {system_prompt}\n\n{user_prompt}\n\nAssistant:",
+            "model": "claude-2",  # Or another appropriate model
+            "max_tokens_to_sample": 2000,
+            "temperature": 0.1,
+            "stream": True
+        }
+        # This API version sends each completion event as a delta rather than the text so far
+        headers = {**self._anthropic_headers, "anthropic-version": "2023-06-01"}
+        
+        try:
+            async with _get_async_http_client().stream(
+                "POST", "https://api.anthropic.com/v1/complete", headers=headers, json=data
+            ) as response:
+                if response.status_code == 429:
+                    retry_after = response.headers.get("retry-after", "")
+                    raise AIProviderBusyError(
+                        self.provider,
+                        retry_after=int(retry_after) if retry_after.isdigit() else AI_MAX_BACKOFF_SECONDS
+                    )
+                if response.status_code != 200:
+                    raise AIProviderError(self.provider, f"API error: {response.status_code}")
+                
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    event = self._parse_provider_json(line[len("data:"):].strip())
+                    if event.get("type") == "error":
+                        raise AIProviderError(self.provider, event.get("error", {}).get("message", "stream error"))
+                    if event.get("completion"):
+                        yield event["completion"]
+        except httpx.HTTPError as e:
+            raise AIProviderError(self.provider, str(e)) from e
+
+    def _build_anti_hallucination_resume_prompts(
+        self,
+        user_databank: Dict[str, Any],
+        job_analysis: Dict[str, Any],
+        coverage_analysis: DatabankCoverage
+    ) -> Tuple[str, str]:
+        """Build the system and user prompts for anti-hallucination resume generation."""
         # Create anti-hallucination system prompt
         system_prompt = """
         You are a resume generator with STRICT anti-hallucination protocols.
@@ -441,13 +701,13 @@ class AIService:
         Create a resume using ONLY the following verified databank information:
         
         USER DATABANK:
-        {json.dumps(user_databank, indent=2)}
+        {to_json(user_databank, indent=2).decode()}
         
         JOB REQUIREMENTS:
-        {json.dumps(job_analysis, indent=2)}
+        {to_json(job_analysis, indent=2).decode()}
         
         COVERAGE ANALYSIS:
-        {coverage_analysis.dict()}
+        {coverage_analysis.model_dump_json(indent=2)}
         
         Generate resume content in JSON format:
         {{
@@ -477,206 +737,148 @@ class AIService:
         
         Remember: Every sentence must be traceable to the provided databank.
         """
-        
-        # Use system prompt for better anti-hallucination enforcement
-        result = self._call_ai_provider_with_system(system_prompt, user_prompt)
-        
-        try:
-            resume_data = result if isinstance(result, dict) else json.loads(result)
-            return resume_data
-        except Exception as e:
-            return {
-                "error": f"Failed to generate anti-hallucination resume: {str(e)}",
-                "databank_utilization_report": {
-                    "utilization_percentage": 0,
-                    "error": "Generation failed"
-                }
-            }
-
-    def _call_openai(self, prompt: str) -> Dict[str, Any]:
-        """Call OpenAI API with the given prompt."""
-        try:
-            import openai
-            openai.api_key = self.api_key
-            
-            response = openai.ChatCompletion.create(
-                model="gpt-4",  # Or another appropriate model
-                messages=[
-                    {"role": "system", "content": "You are a resume analysis assistant."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.2  # Lower temperature for more consistent, factual responses
-            )
-            
-            # Extract and parse the JSON response
-            content = response.choices[0].message.content
-            return json.loads(content)
-        except Exception as e:
-            # In production, we'd have more sophisticated error handling
-            return {"error": str(e)}
-    
-    def _call_anthropic(self, prompt: str) -> Dict[str, Any]:
-        """Call Anthropic API with the given prompt."""
-        try:
-            headers = {
-                "Content-Type": "application/json",
-                "X-API-Key": self.api_key
-            }
-            
-            data = {
-                "prompt": f"\n\nHuman: {prompt}\n\nAssistant:",
-                "model": "claude-2",  # Or another appropriate model
-                "max_tokens_to_sample": 1000,
-                "temperature": 0.2
-            }
-            
-            response = requests.post(
-                "https://api.anthropic.com/v1/complete",
-                headers=headers,
-                json=data
-            )
-            
-            if response.status_code == 200:
-                content = response.json().get("completion", "")
-                return json.loads(content)
-            else:
-                return {"error": f"API error: {response.status_code}"}
-        except Exception as e:
-            return {"error": str(e)}
-    
-    def _call_google(self, prompt: str) -> Dict[str, Any]:
-        """Call Google PaLM API with the given prompt."""
-        try:
-            # This is a placeholder for Google's Generative AI API
-            # The actual implementation would use Google's latest API
-            headers = {
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {self.api_key}"
-            }
-            
-            data = {
-                "prompt": prompt,
-                "temperature": 0.2,
-                "max_output_tokens": 1000
-            }
-            
-            # This URL would be replaced with the actual Google AI API endpoint
-            response = requests.post(
-                "https://api.google.ai/v1/models/text-bison:generateText",
-                headers=headers,
-                json=data
-            )
-            
-            if response.status_code == 200:
-                content = response.json().get("candidates", [{}])[0].get("output", "")
-                return json.loads(content)
-            else:
-                return {"error": f"API error: {response.status_code}"}
-        except Exception as e:
-            return {"error": str(e)}
+        return system_prompt, user_prompt
 
-    def _call_ai_provider(self, prompt: str) -> Dict[str, Any]:
-        """Helper method to call the configured AI provider"""
-        if self.provider == AIProvider.OPENAI:
-            return self._call_openai(prompt)
-        elif self.provider == AIProvider.ANTHROPIC:
-            return self._call_anthropic(prompt)
-        elif self.provider == AIProvider.GOOGLE:
-            return self._call_google(prompt)
-        else:
+    def parse_anti_hallucination_resume(self, result: Any) -> Dict[str, Any]:
+        """Parse a resume response (dict or JSON text), raising AIProviderError if it is unusable."""
+        if isinstance(result, dict):
+            return result
+        return self._parse_provider_json(result)
+
+    def _get_provider_call(self):
+        call_provider = self._provider_calls.get(self.provider)
+        if call_provider is None:
             raise ValueError(f"Unsupported AI provider: {self.provider}")
+        return call_provider
 
-    def _call_ai_provider_with_system(self, system_prompt: str, user_prompt: str) -> Dict[str, Any]:
-        """Helper method to call AI provider with system prompt for better anti-hallucination"""
+    async def _call_ai_provider_async(self, prompt: str) -> Dict[str, Any]:
+        """Async helper method to call the configured AI provider"""
+        return await self._admitted(self._get_provider_call()(prompt))
+
+    async def _call_ai_provider_with_system_async(self, system_prompt: str, user_prompt: str) -> Dict[str, Any]:
+        """Async helper method to call AI provider with system prompt for better anti-hallucination"""
+        call_provider = self._get_provider_call()
         if self.provider == AIProvider.OPENAI:
-            return self._call_openai_with_system(system_prompt, user_prompt)
-        elif self.provider == AIProvider.ANTHROPIC:
-            return self._call_anthropic_with_system(system_prompt, user_prompt)
-        elif self.provider == AIProvider.GOOGLE:
-            return self._call_google_with_system(system_prompt, user_prompt)
+            call = call_provider(user_prompt, system_prompt=system_prompt, temperature=0.1)
         else:
-            raise ValueError(f"Unsupported AI provider: {self.provider}")
+            # The other providers take no separate system prompt
+            call = call_provider(f"{system_prompt}\n\n{user_prompt}", max_tokens=2000, temperature=0.1)
+        return await self._admitted(call)
 
-    def _call_openai_with_system(self, system_prompt: str, user_prompt: str) -> Dict[str, Any]:
-        """Call OpenAI API with system and user prompts for anti-hallucination."""
+    async def _admitted(self, call) -> Dict[str, Any]:
         try:
-            import openai
-            openai.api_key = self.api_key
-            
-            response = openai.ChatCompletion.create(
+            async with self._admission():
+                return await call
+        finally:
+            # Close the coroutine if admission was refused before it ran
+            call.close()
+
+    async def _post_with_retry(self, url: str, headers: Dict[str, str], data: Dict[str, Any]) -> httpx.Response:
+        """
+        POST to a provider, backing off exponentially while it answers 429,
+        fails with a 5xx or drops the connection.
+        Returns only successful responses; anything else raises AIProviderError,
+        or AIProviderBusyError if the provider is still rate limiting.
+        """
+        for attempt in range(AI_MAX_RETRIES + 1):
+            backoff = min(2 ** attempt, AI_MAX_BACKOFF_SECONDS)
+            try:
+                response = await _get_async_http_client().post(url, headers=headers, json=data)
+            except httpx.TimeoutException as e:
+                # Already waited the full timeout; retrying would multiply it
+                raise AIProviderError(self.provider, str(e)) from e
+            except httpx.TransportError as e:
+                if attempt == AI_MAX_RETRIES:
+                    raise AIProviderError(self.provider, str(e)) from e
+                await asyncio.sleep(backoff)
+                continue
+            except httpx.HTTPError as e:
+                raise AIProviderError(self.provider, str(e)) from e
+            if response.status_code in AI_TRANSIENT_STATUS_CODES and attempt < AI_MAX_RETRIES:
+                await asyncio.sleep(backoff)
+                continue
+            if response.status_code != 429:
+                break
+            retry_after = response.headers.get("retry-after", "")
+            delay = min(float(retry_after), AI_MAX_BACKOFF_SECONDS) if retry_after.isdigit() else backoff
+            if attempt == AI_MAX_RETRIES:
+                raise AIProviderBusyError(self.provider, retry_after=math.ceil(delay))
+            await asyncio.sleep(delay)
+
+        if response.status_code != 200:
+            raise AIProviderError(self.provider, f"API error: {response.status_code}")
+        return response
+
+    def _parse_provider_json(self, content: str) -> Dict[str, Any]:
+        try:
+            return from_json(content)
+        except (TypeError, ValueError) as e:
+            raise AIProviderError(self.provider, "response was not valid JSON") from e
+
+    async def _call_openai_async(
+        self,
+        prompt: str,
+        system_prompt: str = "You are a resume analysis assistant.",
+        temperature: float = 0.2
+    ) -> Dict[str, Any]:
+        """Call OpenAI API with the given prompt using the async client."""
+        client = self._get_async_openai_client()
+        
+        try:
+            response = await client.chat.completions.create(
                 model="gpt-4",  # Or another appropriate model
                 messages=[
                     {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
+                    {"role": "user", "content": prompt}
                 ],
-                temperature=0.1  # Very low temperature for factual, non-creative responses
+                temperature=temperature
             )
-            
-            # Extract and parse the JSON response
-            content = response.choices[0].message.content
-            return json.loads(content)
-        except Exception as e:
-            return {"error": str(e)}
+        except RateLimitError as e:
+            # Still limited after the SDK's own retries
+            raise AIProviderBusyError(self.provider, retry_after=AI_MAX_BACKOFF_SECONDS) from e
+        except OpenAIError as e:
+            raise AIProviderError(self.provider, str(e)) from e
+        
+        # Extract and parse the JSON response
+        return self._parse_provider_json(response.choices[0].message.content)
 
-    def _call_anthropic_with_system(self, system_prompt: str, user_prompt: str) -> Dict[str, Any]:
-        """Call Anthropic API with system prompt for anti-hallucination."""
-        try:
-            headers = {
-                "Content-Type": "application/json",
-                "X-API-Key": self.api_key
-            }
-            
-            # Combine system and user prompts for Anthropic
-            combined_prompt = f"{system_prompt}\n\n{user_prompt}"
-            
-            data = {
-                "prompt": f"\n\nHuman: {combined_prompt}\n\nAssistant:",
-                "model": "claude-2",  # Or another appropriate model
-                "max_tokens_to_sample": 2000,
-                "temperature": 0.1  # Very low temperature for factual responses
-            }
-            
-            response = requests.post(
-                "https://api.anthropic.com/v1/complete",
-                headers=headers,
-                json=data
-            )
-            
-            if response.status_code == 200:
-                content = response.json().get("completion", "")
-                return json.loads(content)
-            else:
-                return {"error": f"API error: {response.status_code}"}
-        except Exception as e:
-            return {"error": str(e)}
+    async def _call_anthropic_async(
+        self,
+        prompt: str,
+        max_tokens: int = 1000,
+        temperature: float = 0.2
+    ) -> Dict[str, Any]:
+        """Call Anthropic API with the given prompt without blocking the event loop."""
+        data = {
+            "prompt": f"\n\nHuman: {prompt}\n\nAssistant:",
+            "model": "claude-2",  # Or another appropriate model
+            "max_tokens_to_sample": max_tokens,
+            "temperature": temperature
+        }
+        
+        response = await self._post_with_retry(
+            "https://api.anthropic.com/v1/complete",
+            self._anthropic_headers,
+            data
+        )
+        return self._parse_provider_json(response.json().get("completion", ""))
 
-    def _call_google_with_system(self, system_prompt: str, user_prompt: str) -> Dict[str, Any]:
-        """Call Google PaLM API with system prompt for anti-hallucination."""
-        try:
-            headers = {
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {self.api_key}"
-            }
-            
-            # Combine system and user prompts for Google
-            combined_prompt = f"{system_prompt}\n\n{user_prompt}"
-            
-            data = {
-                "prompt": combined_prompt,
-                "temperature": 0.1,  # Very low temperature for factual responses
-                "max_output_tokens": 2000
-            }
-            
-            response = requests.post(
-                "https://api.google.ai/v1/models/text-bison:generateText",
-                headers=headers,
-                json=data
-            )
-            
-            if response.status_code == 200:
-                content = response.json().get("candidates", [{}])[0].get("output", "")
-                return json.loads(content)
-            else:
-                return {"error": f"API error: {response.status_code}"}
-        except Exception as e:
-            return {"error": str(e)}
\ No newline at end of file
+    async def _call_google_async(
+        self,
+        prompt: str,
+        max_tokens: int = 1000,
+        temperature: float = 0.2
+    ) -> Dict[str, Any]:
+        """Call Google PaLM API with the given prompt without blocking the event loop."""
+        data = {
+            "prompt": prompt,
+            "temperature": temperature,
+            "max_output_tokens": max_tokens
+        }
+        
+        response = await self._post_with_retry(
+            "https://api.google.ai/v1/models/text-bison:generateText",
+            self._google_headers,
+            data
+        )
+        return self._parse_provider_json(response.json().get("candidates", [{}])[0].get("output", ""))
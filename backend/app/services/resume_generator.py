@@ -1,12 +1,41 @@
+import hashlib
 import json
 import os
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Dict, List, Optional, Any, Union
+from pydantic_core import to_json
+from sqlalchemy import delete, select
 from sqlalchemy.orm import Session
 
-from ..models.models import User, Resume, Skill, WorkExperience, Education, Project, Certification, Language
+from ..models.models import (
+    User, Resume, Skill, WorkExperience, Education, Project, Certification, Language,
+    skill_resume_association, work_experience_resume_association, education_resume_association,
+    project_resume_association, certification_resume_association, language_resume_association
+)
 from .resume_schema import generate_jsonld_schema, generate_html_with_jsonld
 
+# Tables linking a resume to the databank items selected for it
+RESUME_ASSOCIATIONS = (
+    skill_resume_association, work_experience_resume_association, education_resume_association,
+    project_resume_association, certification_resume_association, language_resume_association
+)
+
+# User columns that end up in a generated resume
+RESUME_PROFILE_FIELDS = (
+    "full_name", "email", "phone", "website", "linkedin", "github", "twitter",
+    "city", "state", "country", "postal_code", "summary"
+)
+
+def _row_values(row: Any) -> Dict[str, Any]:
+    return {column.key: getattr(row, column.key) for column in row.__table__.columns}
+
+def _items_values(items: List[List[Any]]) -> List[List[Dict[str, Any]]]:
+    return [sorted((_row_values(row) for row in rows), key=lambda values: values["id"]) for rows in items]
+
+def _digest(fingerprint: Dict[str, Any]) -> str:
+    canonical = json.dumps(fingerprint, sort_keys=True, default=str)
+    return hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+
 class ResumeFormat:
     PDF = "pdf"
     WORD = "word"
@@ -43,12 +72,44 @@ class ResumeGenerator:
         Create a new resume for a user with selected information.
         """
         # Get the user
-        user = self.db.query(User).filter(User.id == user_id).first()
+        user = self.db.get(User, user_id)
         if not user:
             raise ValueError(f"User with ID {user_id} not found")
         
+        # Get selected items, one query per section
+        skills = self._get_selected_items(Skill, "skill", user_id, selected_skill_ids, include_skills)
+        work_experiences = self._get_selected_items(WorkExperience, "experience", user_id, selected_experience_ids, include_experience)
+        educations = self._get_selected_items(Education, "education", user_id, selected_education_ids, include_education)
+        projects = self._get_selected_items(Project, "project", user_id, selected_project_ids, include_projects)
+        certifications = self._get_selected_items(Certification, "certification", user_id, selected_certification_ids, include_certifications)
+        languages = self._get_selected_items(Language, "language", user_id, selected_language_ids, include_languages)
+        
+        items = [skills, work_experiences, educations, projects, certifications, languages]
+        
+        # Identical inputs over unchanged data produce the same resume, so a
+        # resubmission returns the resume already generated for them
+        input_hash = self._input_hash(
+            inputs={
+                "title": title,
+                "job_description": job_description.strip(),
+                "format": format,
+                "job_title": job_title,
+                "company_name": company_name,
+                "include": [include_summary, include_skills, include_experience, include_education,
+                            include_projects, include_certifications, include_languages],
+            },
+            user=user,
+            items=items
+        )
+        existing_resume = self.db.query(Resume).filter(
+            Resume.user_id == user_id,
+            Resume.input_hash == input_hash
+        ).first()
+        if existing_resume:
+            return existing_resume
+        
         # Create timestamps
-        now = datetime.utcnow().isoformat()
+        now = datetime.now(timezone.utc)
         
         # Create new resume record
         new_resume = Resume(
@@ -61,6 +122,7 @@ class ResumeGenerator:
             created_at=now,
             last_modified=now,
             content="",  # Will be populated later
+            input_hash=input_hash,
             include_summary=include_summary,
             include_skills=include_skills,
             include_experience=include_experience,
@@ -73,57 +135,15 @@ class ResumeGenerator:
         self.db.add(new_resume)
         self.db.flush()  # Get the new resume ID without committing transaction
         
-        # Get selected items
-        skills = []
-        work_experiences = []
-        educations = []
-        projects = []
-        certifications = []
-        languages = []
-        
-        if selected_skill_ids and include_skills:
-            skills = self.db.query(Skill).filter(
-                Skill.user_id == user_id,
-                Skill.id.in_(selected_skill_ids)
-            ).all()
-            new_resume.skills = skills
-        
-        if selected_experience_ids and include_experience:
-            work_experiences = self.db.query(WorkExperience).filter(
-                WorkExperience.user_id == user_id,
-                WorkExperience.id.in_(selected_experience_ids)
-            ).all()
-            new_resume.work_experiences = work_experiences
-        
-        if selected_education_ids and include_education:
-            educations = self.db.query(Education).filter(
-                Education.user_id == user_id,
-                Education.id.in_(selected_education_ids)
-            ).all()
-            new_resume.educations = educations
+        new_resume.skills = skills
+        new_resume.work_experiences = work_experiences
+        new_resume.educations = educations
+        new_resume.projects = projects
+        new_resume.certifications = certifications
+        new_resume.languages = languages
         
-        if selected_project_ids and include_projects:
-            projects = self.db.query(Project).filter(
-                Project.user_id == user_id,
-                Project.id.in_(selected_project_ids)
-            ).all()
-            new_resume.projects = projects
-        
-        if selected_certification_ids and include_certifications:
-            certifications = self.db.query(Certification).filter(
-                Certification.user_id == user_id,
-                Certification.id.in_(selected_certification_ids)
-            ).all()
-            new_resume.certifications = certifications
-        
-        if selected_language_ids and include_languages:
-            languages = self.db.query(Language).filter(
-                Language.user_id == user_id,
-                Language.id.in_(selected_language_ids)
-            ).all()
-            new_resume.languages = languages
-        
-        # Generate JSON-LD schema
+        # Generate JSON-LD schema, reusing the part built from the same data
+        # for an earlier resume of this user
         jsonld_schema = generate_jsonld_schema(
             user=user,
             resume=new_resume,
@@ -132,17 +152,19 @@ class ResumeGenerator:
             educations=educations,
             projects=projects,
             certifications=certifications,
-            languages=languages
+            languages=languages,
+            cache_key=(user_id, self._schema_data_hash(user, include_summary, items))
         )
         
         # Store the schema in the resume
-        new_resume.schema_jsonld = json.dumps(jsonld_schema)
+        new_resume.schema_jsonld = to_json(jsonld_schema).decode()
         
         # Generate the resume content based on format
         content = self._generate_resume_content(
             user=user,
             resume=new_resume,
             jsonld_schema=jsonld_schema,
+            schema_json=new_resume.schema_jsonld,
             skills=skills,
             work_experiences=work_experiences,
             educations=educations,
@@ -158,17 +180,50 @@ class ResumeGenerator:
         new_resume.ats_score = ats_score
         new_resume.ats_feedback = ats_feedback
         
-        # Commit the changes
+        # Commit the changes. The row keeps its loaded state after commit, so
+        # no refresh is needed to return it.
         self.db.commit()
-        self.db.refresh(new_resume)
         
         return new_resume
     
+    def _get_selected_items(self, model: Any, label: str, user_id: int, selected_ids: Optional[List[int]], include: bool) -> List[Any]:
+        """
+        Load the user's selected rows of one section.
+        Raises ValueError if any selected ID is not one of the user's rows.
+        """
+        if not selected_ids or not include:
+            return []
+        items = self.db.query(model).filter(
+            model.user_id == user_id,
+            model.id.in_(selected_ids)
+        ).all()
+        missing_ids = set(selected_ids) - {item.id for item in items}
+        if missing_ids:
+            raise ValueError(f"Selected {label} IDs not found: {sorted(missing_ids)}")
+        return items
+    
+    def _input_hash(self, inputs: Dict[str, Any], user: User, items: List[List[Any]]) -> str:
+        """BLAKE2b digest of the resume inputs and every value of the data they select."""
+        return _digest({
+            "inputs": inputs,
+            "profile": {field: getattr(user, field) for field in RESUME_PROFILE_FIELDS},
+            "items": _items_values(items),
+        })
+    
+    def _schema_data_hash(self, user: User, include_summary: bool, items: List[List[Any]]) -> str:
+        """BLAKE2b digest of everything the schema reads besides the resume's header fields."""
+        return _digest({
+            "include_summary": include_summary,
+            "profile": {field: getattr(user, field) for field in (*RESUME_PROFILE_FIELDS, "username")},
+            "items": _items_values(items),
+        })
+    
     def _generate_resume_content(
         self,
         user: User,
         resume: Resume,
         jsonld_schema: Dict[str, Any],
+        schema_json: str,
         skills: List[Skill],
         work_experiences: List[WorkExperience],
         educations: List[Education],
@@ -179,6 +234,7 @@ class ResumeGenerator:
         """
         Generate the resume content based on the selected format.
         For now, returns a placeholder. Will be extended to generate actual content.
+        schema_json is jsonld_schema as already serialized for the resume.
         """
         if resume.format == ResumeFormat.HTML:
             # For HTML, we'll generate the HTML with embedded JSON-LD
@@ -186,30 +242,24 @@ class ResumeGenerator:
         elif resume.format == ResumeFormat.PDF:
             # For PDF, we'll need to generate the content that will be used to create the PDF
             # This is a placeholder - actual implementation would use a PDF library
-            return json.dumps({
-                "format": "pdf",
-                "schema": jsonld_schema,
-                "template": "default"
-            })
+            return self._placeholder_content("pdf", schema_json)
         elif resume.format == ResumeFormat.WORD:
             # For Word, we'll need to generate the content that will be used to create the document
             # This is a placeholder - actual implementation would use a Word document library
-            return json.dumps({
-                "format": "word",
-                "schema": jsonld_schema,
-                "template": "default"
-            })
+            return self._placeholder_content("word", schema_json)
         elif resume.format == ResumeFormat.LATEX:
             # For LaTeX, we'll need to generate the LaTeX code
             # This is a placeholder - actual implementation would generate LaTeX code
-            return json.dumps({
-                "format": "latex",
-                "schema": jsonld_schema,
-                "template": "default"
-            })
+            return self._placeholder_content("latex", schema_json)
         else:
             # Default to JSON if format is not recognized
-            return json.dumps(jsonld_schema, indent=2)
+            return to_json(jsonld_schema, indent=2).decode()
+    
+    def _placeholder_content(self, format: str, schema_json: str) -> str:
+        """Wrap the serialized schema for a format whose renderer is not implemented yet."""
+        # Splice in the schema instead of serializing it again; this is the
+        # same JSON that to_json gives for the whole payload
+        return f'{{"format":"{format}","schema":{schema_json},"template":"default"}}'
     
     def _calculate_ats_score(
         self,
@@ -257,15 +307,15 @@ class ResumeGenerator:
             score -= 5
             feedback.append("No professional summary included")
         
-        if not jsonld_schema.get("skills") or len(jsonld_schema.get("skills", [])) == 0:
+        if not jsonld_schema.get("skills"):
             score -= 15
             feedback.append("No skills listed")
         
-        if not jsonld_schema.get("workExperience") or len(jsonld_schema.get("workExperience", [])) == 0:
+        if not jsonld_schema.get("workExperience"):
             score -= 15
             feedback.append("No work experience listed")
         
-        if not jsonld_schema.get("education") or len(jsonld_schema.get("education", [])) == 0:
+        if not jsonld_schema.get("education"):
             score -= 10
             feedback.append("No education history listed")
         
@@ -282,20 +332,22 @@ class ResumeGenerator:
         """
         Get a resume by ID.
         """
-        return self.db.query(Resume).filter(Resume.id == resume_id).first()
+        return self.db.get(Resume, resume_id)
     
     def delete_resume(self, resume_id: int, user_id: int) -> bool:
         """
         Delete a resume by ID if it belongs to the user.
         """
-        resume = self.db.query(Resume).filter(
-            Resume.id == resume_id,
-            Resume.user_id == user_id
-        ).first()
-        
-        if not resume:
+        owned_resume = select(Resume.id).where(Resume.id == resume_id, Resume.user_id == user_id)
+        # Clear the selected items first, as the ORM delete did after loading
+        # each collection; the subquery keeps this to the user's own resume
+        for association in RESUME_ASSOCIATIONS:
+            self.db.execute(delete(association).where(association.c.resume_id.in_(owned_resume)))
+        
+        result = self.db.execute(delete(Resume).where(Resume.id == resume_id, Resume.user_id == user_id))
+        if result.rowcount == 0:
+            self.db.rollback()
             return False
         
-        self.db.delete(resume)
         self.db.commit()
         return True
\ No newline at end of file
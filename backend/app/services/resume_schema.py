@@ -1,9 +1,55 @@
+import html
 import json
+import threading
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, Hashable, List, Optional, Any
+from cachetools import LRUCache
+from pydantic_core import to_json
 
 from ..models.models import User, Resume, Skill, WorkExperience, Education, Project, Certification, Language
 
+# User columns linked as profile pages, with the name each is shown under
+SOCIAL_PROFILE_FIELDS = (("linkedin", "LinkedIn"), ("github", "GitHub"), ("twitter", "Twitter"))
+
+# Schema bodies of recent generations, keyed by user id and a digest of the
+# data they were built from. Users often regenerate from the same databank
+# selection for another job, which changes only the per-resume header fields.
+# Entries are shared between resumes, so callers must not mutate the schema.
+SCHEMA_CACHE_SIZE = 256
+_schema_cache = LRUCache(maxsize=SCHEMA_CACHE_SIZE)
+_schema_cache_lock = threading.Lock()
+
+def _stored_list(value: str, fallback: List[Any]) -> List[Any]:
+    """Return a text field stored as a JSON array as a list, or fallback if it holds anything else."""
+    # Plain text rarely starts with "[", so most values skip the parse and its exception
+    if not value.lstrip().startswith("["):
+        return fallback
+    try:
+        parsed = json.loads(value)
+    except json.JSONDecodeError:
+        return fallback
+    return parsed if isinstance(parsed, list) else fallback
+
+def _postal_address(
+    city: Optional[str],
+    state: Optional[str],
+    country: Optional[str],
+    postal_code: Optional[str] = None
+) -> Optional[Dict[str, Any]]:
+    """Build a PostalAddress from whichever parts are set, or None if none are."""
+    if not (city or state or country or postal_code):
+        return None
+    address = {"@type": "PostalAddress"}
+    if city:
+        address["addressLocality"] = city
+    if state:
+        address["addressRegion"] = state
+    if country:
+        address["addressCountry"] = country
+    if postal_code:
+        address["postalCode"] = postal_code
+    return address
+
 def generate_jsonld_schema(
     user: User,
     resume: Resume,
@@ -12,22 +58,51 @@ def generate_jsonld_schema(
     educations: List[Education],
     projects: Optional[List[Project]] = None,
     certifications: Optional[List[Certification]] = None,
-    languages: Optional[List[Language]] = None
+    languages: Optional[List[Language]] = None,
+    cache_key: Optional[Hashable] = None
 ) -> Dict[str, Any]:
     """
     Generate JSON-LD schema for a resume following the resume-standard.
     This makes the resume more ATS-friendly.
+    cache_key identifies the user's data behind everything but the resume's
+    own header fields; when given, that part is reused between resumes.
     """
     # Base schema
     schema = {
         "@context": "https://schema.org/",
         "@type": "Resume",
         "identifier": f"resume-{resume.id}",
-        "dateCreated": resume.created_at,
-        "dateModified": resume.last_modified or resume.created_at,
+        "dateCreated": resume.created_at.isoformat(),
+        "dateModified": (resume.last_modified or resume.created_at).isoformat(),
         "name": resume.title,
     }
     
+    if cache_key is None:
+        body = None
+    else:
+        with _schema_cache_lock:
+            body = _schema_cache.get(cache_key)
+    if body is None:
+        body = _schema_body(user, resume, skills, work_experiences, educations, projects, certifications, languages)
+        if cache_key is not None:
+            with _schema_cache_lock:
+                _schema_cache[cache_key] = body
+    schema.update(body)
+    return schema
+
+def _schema_body(
+    user: User,
+    resume: Resume,
+    skills: List[Skill],
+    work_experiences: List[WorkExperience],
+    educations: List[Education],
+    projects: Optional[List[Project]],
+    certifications: Optional[List[Certification]],
+    languages: Optional[List[Language]]
+) -> Dict[str, Any]:
+    """Build the schema fields that depend only on the user's data and the include flags."""
+    schema = {}
+    
     # Add person information
     schema["person"] = {
         "@type": "Person",
@@ -42,39 +117,20 @@ def generate_jsonld_schema(
     if user.website:
         schema["person"]["url"] = user.website
     
-    if any([user.city, user.state, user.country, user.postal_code]):
-        schema["person"]["address"] = {
-            "@type": "PostalAddress",
-        }
-        if user.city:
-            schema["person"]["address"]["addressLocality"] = user.city
-        if user.state:
-            schema["person"]["address"]["addressRegion"] = user.state
-        if user.country:
-            schema["person"]["address"]["addressCountry"] = user.country
-        if user.postal_code:
-            schema["person"]["address"]["postalCode"] = user.postal_code
+    address = _postal_address(user.city, user.state, user.country, user.postal_code)
+    if address:
+        schema["person"]["address"] = address
     
     # Add social profiles if available
     social_profiles = []
-    if user.linkedin:
-        social_profiles.append({
-            "@type": "ProfilePage",
-            "name": "LinkedIn",
-            "url": user.linkedin
-        })
-    if user.github:
-        social_profiles.append({
-            "@type": "ProfilePage",
-            "name": "GitHub",
-            "url": user.github
-        })
-    if user.twitter:
-        social_profiles.append({
-            "@type": "ProfilePage",
-            "name": "Twitter",
-            "url": user.twitter
-        })
+    for field, name in SOCIAL_PROFILE_FIELDS:
+        url = getattr(user, field)
+        if url:
+            social_profiles.append({
+                "@type": "ProfilePage",
+                "name": name,
+                "url": url
+            })
     
     if social_profiles:
         schema["person"]["sameAs"] = social_profiles
@@ -124,46 +180,22 @@ def generate_jsonld_schema(
                 exp_obj["endDate"] = exp.end_date.isoformat()
             
             # Add location if available
-            if any([exp.city, exp.state, exp.country]):
-                exp_obj["location"] = {
-                    "@type": "Place",
-                    "address": {
-                        "@type": "PostalAddress"
-                    }
-                }
-                if exp.city:
-                    exp_obj["location"]["address"]["addressLocality"] = exp.city
-                if exp.state:
-                    exp_obj["location"]["address"]["addressRegion"] = exp.state
-                if exp.country:
-                    exp_obj["location"]["address"]["addressCountry"] = exp.country
+            address = _postal_address(exp.city, exp.state, exp.country)
+            if address:
+                exp_obj["location"] = {"@type": "Place", "address": address}
             
             # Add description and responsibilities
             if exp.description:
                 exp_obj["description"] = exp.description
                 
             if exp.responsibilities:
-                # Handle responsibilities as a list if it's stored as JSON
-                try:
-                    responsibilities = json.loads(exp.responsibilities)
-                    if isinstance(responsibilities, list):
-                        exp_obj["responsibilities"] = responsibilities
-                    else:
-                        exp_obj["responsibilities"] = [exp.responsibilities]
-                except json.JSONDecodeError:
-                    # If it's not valid JSON, treat it as a single string
-                    exp_obj["responsibilities"] = [exp.responsibilities]
+                # Handle responsibilities as a list if it's stored as JSON,
+                # otherwise treat it as a single string
+                exp_obj["responsibilities"] = _stored_list(exp.responsibilities, [exp.responsibilities])
             
             # Add achievements if available
             if exp.achievements:
-                try:
-                    achievements = json.loads(exp.achievements)
-                    if isinstance(achievements, list):
-                        exp_obj["achievements"] = achievements
-                    else:
-                        exp_obj["achievements"] = [exp.achievements]
-                except json.JSONDecodeError:
-                    exp_obj["achievements"] = [exp.achievements]
+                exp_obj["achievements"] = _stored_list(exp.achievements, [exp.achievements])
             
             schema["workExperience"].append(exp_obj)
     
@@ -187,19 +219,9 @@ def generate_jsonld_schema(
                 edu_obj["endDate"] = edu.end_date.isoformat()
             
             # Add location if available
-            if any([edu.city, edu.state, edu.country]):
-                edu_obj["location"] = {
-                    "@type": "Place",
-                    "address": {
-                        "@type": "PostalAddress"
-                    }
-                }
-                if edu.city:
-                    edu_obj["location"]["address"]["addressLocality"] = edu.city
-                if edu.state:
-                    edu_obj["location"]["address"]["addressRegion"] = edu.state
-                if edu.country:
-                    edu_obj["location"]["address"]["addressCountry"] = edu.country
+            address = _postal_address(edu.city, edu.state, edu.country)
+            if address:
+                edu_obj["location"] = {"@type": "Place", "address": address}
             
             # Add GPA if available
             if edu.gpa:
@@ -207,24 +229,10 @@ def generate_jsonld_schema(
                 
             # Add achievements and activities if available
             if edu.achievements:
-                try:
-                    achievements = json.loads(edu.achievements)
-                    if isinstance(achievements, list):
-                        edu_obj["achievements"] = achievements
-                    else:
-                        edu_obj["achievements"] = [edu.achievements]
-                except json.JSONDecodeError:
-                    edu_obj["achievements"] = [edu.achievements]
+                edu_obj["achievements"] = _stored_list(edu.achievements, [edu.achievements])
                     
             if edu.activities:
-                try:
-                    activities = json.loads(edu.activities)
-                    if isinstance(activities, list):
-                        edu_obj["activities"] = activities
-                    else:
-                        edu_obj["activities"] = [edu.activities]
-                except json.JSONDecodeError:
-                    edu_obj["activities"] = [edu.activities]
+                edu_obj["activities"] = _stored_list(edu.activities, [edu.activities])
             
             schema["education"].append(edu_obj)
     
@@ -251,14 +259,7 @@ def generate_jsonld_schema(
             
             # Add technologies if available
             if project.technologies:
-                try:
-                    technologies = json.loads(project.technologies)
-                    if isinstance(technologies, list):
-                        project_obj["keywords"] = technologies
-                    else:
-                        project_obj["keywords"] = project.technologies.split(",")
-                except json.JSONDecodeError:
-                    project_obj["keywords"] = project.technologies.split(",")
+                project_obj["keywords"] = _stored_list(project.technologies, project.technologies.split(","))
             
             schema["projects"].append(project_obj)
     
@@ -311,16 +312,17 @@ def generate_html_with_jsonld(
     Generate HTML document with embedded JSON-LD metadata.
     This is critical for ATS compatibility.
     """
-    # Convert JSON-LD to string
-    jsonld_str = json.dumps(jsonld_schema, indent=2)
+    # Convert JSON-LD to string. "<" is written as its JSON escape so that
+    # user text such as "</script>" cannot close the script element early.
+    jsonld_str = to_json(jsonld_schema, indent=2).decode().replace("<", "\\u003c")
     
     # Create basic HTML structure with embedded JSON-LD
-    html = f"""<!DOCTYPE html>
+    html_document = f"""<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{resume.title}</title>
+    <title>{html.escape(resume.title)}</title>
     <script type="application/ld+json">
 {jsonld_str}
     </script>
@@ -337,4 +339,4 @@ def generate_html_with_jsonld(
 </body>
 </html>"""
     
-    return html
\ No newline at end of file
+    return html_document
\ No newline at end of file
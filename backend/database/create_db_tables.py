@@ -1,10 +1,21 @@
+import os
+
+from alembic import command
+from alembic.config import Config
+
 from app.core.database import engine, Base
 from app.models import models  # Ensure all models are imported
 
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic.ini")
+
 def main():
     print("Creating database tables...")
-    # This will create all tables defined in models that inherit from Base
+    # This will create all tables defined in models that inherit from Base.
+    # create_all never alters tables that already exist: existing databases
+    # are brought up to date with `alembic upgrade head` instead.
     Base.metadata.create_all(bind=engine)
+    # The new tables already match the latest migration
+    command.stamp(Config(ALEMBIC_INI), "head")
     print("Database tables created successfully!")
 
 if __name__ == "__main__":
@@ -1,23 +1,59 @@
 #!/usr/bin/env python3
 
-import requests
-import json
+import asyncio
+import os
+import statistics
+import sys
+import time
 
-# Test skills API without authentication first
-url = "http://localhost:8000/api/skills"
+import httpx
+
+# Test skills API without authentication unless AUTH_TOKEN is set, then fire
+# concurrent requests at it to see how it holds up under load:
+#   python test_skills_api.py [requests] [concurrency]
+base_url = "http://localhost:8000"
+path = "/api/skills/"
+token = os.getenv("AUTH_TOKEN")
+headers = {"Authorization": f"Bearer {token}"} if token else {}
+
+async def timed_get(client: httpx.AsyncClient, slots: asyncio.Semaphore):
+    async with slots:
+        start = time.perf_counter()
+        response = await client.get(path)
+        return response.status_code, time.perf_counter() - start
+
+async def main(total: int, concurrency: int):
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, limits=limits) as client:
+        response = await client.get(path)
+        print(f"Status code: {response.status_code}")
+        print(f"Headers: {dict(response.headers)}")
+
+        if response.status_code == 200:
+            print("Success!")
+            skills = response.json()
+            print(f"Retrieved {len(skills)} skills")
+        else:
+            print(f"Error response:")
+            print(response.text)
+
+        slots = asyncio.Semaphore(concurrency)
+        start = time.perf_counter()
+        results = await asyncio.gather(*[timed_get(client, slots) for _ in range(total)])
+        elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency for _, latency in results)
+    statuses = {}
+    for status_code, _ in results:
+        statuses[status_code] = statuses.get(status_code, 0) + 1
+    print(f"\n{total} requests, {concurrency} concurrent: {total / elapsed:.1f} req/s")
+    print(f"Status codes: {statuses}")
+    print(f"p50 {statistics.median(latencies) * 1000:.1f} ms, "
+          f"p99 {latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000:.1f} ms")
 
 try:
-    response = requests.get(url)
-    print(f"Status code: {response.status_code}")
-    print(f"Headers: {dict(response.headers)}")
-    
-    if response.status_code == 200:
-        print("Success!")
-        skills = response.json()
-        print(f"Retrieved {len(skills)} skills")
-    else:
-        print(f"Error response:")
-        print(response.text)
-        
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    asyncio.run(main(total, concurrency))
 except Exception as e:
     print(f"Request failed: {e}")